@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import yaml
+
+from gitportfolio.dsl import EvaluationContext
+from gitportfolio.exceptions import GitPortfolioError
+from gitportfolio.logger import get_logger
+from gitportfolio.renderer import render_file
+
+DEFAULT_JOBS = 4
+
+
+def read_manifest(filename: str) -> list[tuple[str, str]]:
+    with Path(filename).open(mode="r", encoding="utf-8") as file:
+        manifest = yaml.safe_load(file.read()) or {}
+
+    # The paths are relative to the folder of the manifest.
+    folder = Path(filename).parent
+
+    renders = []
+    for entry in manifest.get("renders", None) or []:
+        if not isinstance(entry, dict) or not (
+            "template" in entry and "output" in entry
+        ):
+            raise InvalidManifestError
+
+        renders.append(
+            (
+                str(folder.joinpath(entry["template"])),
+                str(folder.joinpath(entry["output"])),
+            ),
+        )
+
+    get_logger().info(f"The manifest contains {len(renders)} renders.")
+
+    return renders
+
+
+def render_files(
+    custom_datasources_folder: str,
+    renders: list[tuple[str, str]],
+    jobs: int = DEFAULT_JOBS,
+) -> None:
+    # The data is fetched once, before the renders start, and shared by all
+    # of them.
+    context = EvaluationContext()
+    context.get_repos()
+
+    def render_single_file(render: tuple[str, str]) -> None:
+        template, output = render
+
+        render_file(custom_datasources_folder, template, output, context)
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        # Consuming the results raises the first rendering error.
+        list(executor.map(render_single_file, renders))
+
+
+class InvalidManifestError(GitPortfolioError):
+    """Each render in the manifest should have a template and an output."""
@@ -1,28 +1,402 @@
 from __future__ import annotations
 
-import pickle
+import contextlib
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
 import typing
 from pathlib import Path
 
+try:
+    import fcntl
+except ImportError:
+    # The cache folder is not locked on the platforms without fcntl, such as
+    # Windows, where the writes are still atomic.
+    fcntl = None  # type: ignore[assignment]
+
 from gitportfolio.exceptions import GitPortfolioError
 from gitportfolio.helpers import Singleton
 from gitportfolio.logger import get_logger
+from gitportfolio.serialization import (
+    FORMAT_VERSION,
+    SCHEMAS,
+    CorruptedCacheError,
+    Decoder,
+    IncompatibleCacheError,
+    decode_document,
+    encode_document,
+    encode_record,
+)
+from gitportfolio.tracing import count, span
+
+BACKUP_EXTENSION = ".json"
+TEMPORARY_EXTENSION = ".tmp"
+LOCK_FILENAME = ".lock"
+DEFAULT_FILE_MODE = 0o644
+RECORDS_FILENAME = "records.sqlite"
+RECORDS_SUFFIXES = ("", "-journal", "-wal", "-shm")
+RECORDS_TIMEOUT = 30
+RECORDS_CORRUPTION_ERRORS = frozenset(("SQLITE_CORRUPT", "SQLITE_NOTADB"))
+MMAP_SIZE = 256 * 1024 * 1024
+RECORDS_TABLES = ("records", "collections", "schemas")
+NAMESPACE_SEPARATOR = "."
+
+records_connections: dict[Path, sqlite3.Connection] = {}
+records_files: dict[Path, os.stat_result] = {}
+records_lock = threading.RLock()
+
+
+def get_namespaced_identifier(namespace: str, identifier: str) -> str:
+    return f"{namespace}{NAMESPACE_SEPARATOR}{identifier}"
+
+
+def get_base_identifier(identifier: str) -> str:
+    return identifier.rpartition(NAMESPACE_SEPARATOR)[2]
+
+
+def get_namespace(identifier: str) -> str:
+    return identifier.rpartition(NAMESPACE_SEPARATOR)[0]
+
+
+def prepare_records(connection: sqlite3.Connection) -> None:
+    (version,) = connection.execute("PRAGMA user_version").fetchone()
+    if version == FORMAT_VERSION:
+        return
+
+    connection.execute("BEGIN IMMEDIATE")
+
+    # Another connection may have prepared the records in the meantime.
+    (version,) = connection.execute("PRAGMA user_version").fetchone()
+    if version == FORMAT_VERSION:
+        connection.commit()
+
+        return
+
+    (tables_count,) = connection.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table'",
+    ).fetchone()
+    if tables_count:
+        get_logger().warning(
+            "The cached records were written in an incompatible format. They"
+            " will be discarded and fetched again.",
+        )
+
+    for table in RECORDS_TABLES:
+        connection.execute(f"DROP TABLE IF EXISTS {table}")
+
+    connection.execute(
+        "CREATE TABLE records (collection TEXT NOT NULL, key TEXT NOT NULL,"
+        " position INTEGER NOT NULL, kind TEXT NOT NULL, value BLOB NOT NULL,"
+        " PRIMARY KEY (collection, key))",
+    )
+    connection.execute(
+        "CREATE TABLE collections (collection TEXT PRIMARY KEY, updated_at"
+        " REAL NOT NULL)",
+    )
+    connection.execute(
+        "CREATE TABLE schemas (facade TEXT PRIMARY KEY, members TEXT NOT"
+        " NULL)",
+    )
+    connection.execute(f"PRAGMA user_version = {FORMAT_VERSION}")
+    connection.commit()
+
+
+def get_stored_schemas(connection: sqlite3.Connection) -> dict[str, list]:
+    return {
+        facade: json.loads(members)
+        for facade, members in connection.execute(
+            "SELECT facade, members FROM schemas",
+        )
+    }
+
+
+def open_records(path: Path) -> sqlite3.Connection:
+    # The concurrent runs sharing the cache folder wait for the transactions
+    # of the others, which SQLite serialises.
+    connection = sqlite3.connect(
+        path,
+        timeout=RECORDS_TIMEOUT,
+        check_same_thread=False,
+    )
+
+    # The opened file is kept, so that only this one is discarded when it is
+    # corrupted, and not a new file written by another run meanwhile.
+    records_files[path] = path.stat()
+
+    try:
+        # The records are read through a memory mapping of the file, instead
+        # of being copied.
+        connection.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+
+        prepare_records(connection)
+    except BaseException:
+        connection.close()
+
+        raise
+
+    return connection
+
+
+@contextlib.contextmanager
+def connect_records(path: Path) -> typing.Iterator[sqlite3.Connection]:
+    # A single connection per file is opened, and prepared, for the whole
+    # run. Its transactions are serialised between the threads, and share
+    # the folder lock with the other runs, which is held alone to discard the
+    # file.
+    with records_lock, lock_folder(str(path.parent), shared=True):
+        try:
+            stat = records_files.get(path, None)
+            if stat is not None and not is_same_inode(path, stat):
+                close_records(path)
+
+            connection = records_connections.get(path, None)
+            if connection is None:
+                connection = open_records(path)
+                records_connections[path] = connection
+
+            # The transaction is committed when exiting the context.
+            with connection:
+                yield connection
+        except sqlite3.DatabaseError as error:
+            if error.sqlite_errorname in RECORDS_CORRUPTION_ERRORS:
+                raise CorruptedCacheError from error
+
+            raise
+
+
+def close_records(path: Path | None = None) -> None:
+    with records_lock:
+        paths = list(records_connections) if path is None else [path]
+        for current_path in paths:
+            records_files.pop(current_path, None)
+            connection = records_connections.pop(current_path, None)
+            if connection is not None:
+                connection.close()
+
+
+@contextlib.contextmanager
+def lock_folder(
+    folder: str,
+    *,
+    shared: bool = False,
+) -> typing.Iterator[None]:
+    if fcntl is None:
+        yield
+
+        return
+
+    # The readers share the lock, while a writer holds it alone. The lock is
+    # released with the file, even when the process crashes.
+    with Path(folder).joinpath(LOCK_FILENAME).open(mode="ab") as file:
+        with span("cache.lock"):
+            fcntl.flock(file, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+
+        yield
+
+
+def write_atomically(path: Path, data: bytes) -> None:
+    # The data is written into a temporary file, which then replaces the
+    # previous one at once, so that a crash never leaves a truncated file.
+    file = tempfile.NamedTemporaryFile(  # noqa: SIM115
+        dir=path.parent,
+        prefix=path.name + ".",
+        suffix=TEMPORARY_EXTENSION,
+        delete=False,
+    )
+
+    try:
+        with file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+
+        # The temporary files are only readable by their owner, while the
+        # cache folder may be shared between users.
+        if path.exists():
+            shutil.copymode(path, file.name)
+        else:
+            Path(file.name).chmod(DEFAULT_FILE_MODE)
+
+        Path(file.name).replace(path)
+    except BaseException:
+        Path(file.name).unlink(missing_ok=True)
+
+        raise
+
+
+def is_same_file(path: Path, stat: os.stat_result) -> bool:
+    try:
+        current_stat = path.stat()
+    except FileNotFoundError:
+        return False
+
+    return (current_stat.st_ino, current_stat.st_mtime_ns) == (
+        stat.st_ino,
+        stat.st_mtime_ns,
+    )
+
+
+def is_same_inode(path: Path, stat: os.stat_result) -> bool:
+    try:
+        current_stat = path.stat()
+    except FileNotFoundError:
+        return False
+
+    return (current_stat.st_dev, current_stat.st_ino) == (
+        stat.st_dev,
+        stat.st_ino,
+    )
 
-BACKUP_EXTENSION = ".pickle"
+
+def count_lookup(identifier: str, *, found: bool) -> None:
+    count(f"cache.{identifier}.{'hits' if found else 'misses'}")
+
+
+class CachedRecords:
+    identifier: str
+    path: Path | None
+    records: dict[str, typing.Any]
+    decoder: Decoder
+
+    def __init__(
+        self,
+        identifier: str,
+        path: Path | None = None,
+        records: dict[str, typing.Any] | None = None,
+        decoder: Decoder | None = None,
+    ) -> None:
+        self.identifier = identifier
+        self.path = path
+        self.records = records or {}
+        self.decoder = decoder or Decoder()
+
+    def keys(self) -> list[str]:
+        if self.path is None:
+            return list(self.records.keys())
+
+        try:
+            with connect_records(self.path) as connection:
+                rows = connection.execute(
+                    "SELECT key FROM records WHERE collection = ? ORDER BY"
+                    " position",
+                    (self.identifier,),
+                )
+
+                return [key for (key,) in rows]
+        except CorruptedCacheError:
+            Cache().recover_records()
+
+            return []
+
+    def get(self, key: str) -> typing.Any:
+        if key in self.records or self.path is None:
+            return self.records.get(key, None)
+
+        # The corrupted records are discarded, and the lookup is a miss.
+        try:
+            with connect_records(self.path) as connection:
+                row = connection.execute(
+                    "SELECT kind, value FROM records WHERE collection = ? AND"
+                    " key = ?",
+                    (self.identifier, key),
+                ).fetchone()
+        except CorruptedCacheError:
+            Cache().recover_records()
+
+            return None
+
+        if row is None:
+            return None
+
+        count("cache.bytes_read", len(row[1]))
+
+        with span("cache.decode"):
+            self.records[key] = self.decoder.decode_record(*row)
+
+        return self.records[key]
+
+    def __iter__(self) -> typing.Iterator[typing.Any]:
+        if self.path is None:
+            yield from self.records.values()
+
+            return
+
+        # The rows are read at once, so that the connection is not held while
+        # the records are consumed, but decoded lazily, one at a time.
+        try:
+            with connect_records(self.path) as connection:
+                rows = connection.execute(
+                    "SELECT key, kind, value FROM records WHERE collection = ?"
+                    " ORDER BY position",
+                    (self.identifier,),
+                ).fetchall()
+        except CorruptedCacheError:
+            Cache().recover_records()
+
+            return
+
+        bytes_read = 0
+        try:
+            for key, kind, value in rows:
+                if key not in self.records:
+                    bytes_read += len(value)
+
+                    with span("cache.decode"):
+                        self.records[key] = self.decoder.decode_record(
+                            kind,
+                            value,
+                        )
+
+                yield self.records[key]
+        finally:
+            count("cache.bytes_read", bytes_read)
+
+    def __len__(self) -> int:
+        if self.path is None:
+            return len(self.records)
+
+        try:
+            with connect_records(self.path) as connection:
+                (count,) = connection.execute(
+                    "SELECT COUNT(*) FROM records WHERE collection = ?",
+                    (self.identifier,),
+                ).fetchone()
+
+                return count
+        except CorruptedCacheError:
+            Cache().recover_records()
+
+            return 0
 
 
 class Cache(metaclass=Singleton):
     disabled: bool
     cache_folder: str
     cache: dict[str, object] = {}
+    timestamps: dict[str, float]
+    default_ttl: float | None
+    ttls: dict[str, float]
+    revalidations: dict[str, threading.Thread]
+    revalidations_lock: threading.Lock
 
     def __init__(
         self,
         cache_folder: str = "",
         *,
         disabled: bool = False,
+        default_ttl: float | None = None,
+        ttls: dict[str, float] | None = None,
     ) -> None:
         self.disabled = disabled
+        self.timestamps = {}
+        self.default_ttl = default_ttl
+        self.ttls = ttls or {}
+        self.revalidations = {}
+        self.revalidations_lock = threading.Lock()
 
         if not disabled and cache_folder == "":
             raise UnspecifiedCacheFolderError
@@ -45,23 +419,268 @@ class Cache(metaclass=Singleton):
     ) -> None:
         # In-memory caching
         self.cache[identifier] = obj
+        self.timestamps[identifier] = time.time()
 
         if self.disabled:
             return
 
         # File-based caching
-        with Path(self.cache_folder).joinpath(
-            identifier + BACKUP_EXTENSION,
-        ).open(
-            mode="wb",
-        ) as file:
-            file.write(pickle.dumps(obj))
+        with span("cache.write"):
+            data = encode_document(obj)
+
+            with lock_folder(self.cache_folder):
+                write_atomically(self.get_path(identifier), data)
+
+        count("cache.bytes_written", len(data))
+
+        get_logger().info(
+            f'The object "{identifier}" were dumped into the cache file.',
+        )
+
+    def get_records_path(self) -> Path:
+        return Path(self.cache_folder).joinpath(RECORDS_FILENAME)
+
+    def cache_records(
+        self,
+        identifier: str,
+        records: dict[str, typing.Any],
+        *,
+        partial: bool = False,
+    ) -> None:
+        # In-memory caching
+        cached_records = self.cache.get(identifier, None)
+        if partial and isinstance(cached_records, CachedRecords):
+            cached_records.records.update(records)
+        else:
+            self.cache[identifier] = CachedRecords(
+                identifier,
+                None if self.disabled else self.get_records_path(),
+                dict(records),
+            )
+
+        # Only a full write refreshes a collection, which keeps its age when
+        # a part of it is updated.
+        if not partial or identifier not in self.timestamps:
+            self.timestamps[identifier] = time.time()
+
+        if self.disabled:
+            return
+
+        # File-based caching, which starts over from an empty file when the
+        # existing one is corrupted
+        try:
+            rows = self.write_records(identifier, records, partial=partial)
+        except CorruptedCacheError:
+            self.recover_records()
 
+            # A part of a collection is not written alone, so that the whole
+            # collection is fetched again.
+            if partial:
+                return
+
+            rows = self.write_records(identifier, records, partial=partial)
+
+        count("cache.bytes_written", sum(len(row[-1]) for row in rows))
+
+        get_logger().info(
+            f"{len(records)} records were dumped into the cached collection"
+            f' "{identifier}".',
+        )
+
+    def write_records(
+        self,
+        identifier: str,
+        records: dict[str, typing.Any],
+        *,
+        partial: bool,
+    ) -> list[tuple]:
+        # Only the changed records are written.
+        with span("cache.write"), connect_records(
+            self.get_records_path(),
+        ) as connection:
+            self.update_schemas(connection)
+
+            existing_keys = {
+                key: position
+                for key, position in connection.execute(
+                    "SELECT key, position FROM records WHERE collection = ?",
+                    (identifier,),
+                )
+            }
+
+            if partial:
+                first_position = max(existing_keys.values(), default=-1) + 1
+                positions = {
+                    key: existing_keys.get(key, first_position + index)
+                    for index, key in enumerate(records.keys())
+                }
+            else:
+                positions = {key: index for index, key in enumerate(records)}
+
+                connection.executemany(
+                    "DELETE FROM records WHERE collection = ? AND key = ?",
+                    [
+                        (identifier, key)
+                        for key in existing_keys
+                        if key not in records
+                    ],
+                )
+
+            rows = [
+                (identifier, key, positions[key], *encode_record(record))
+                for key, record in records.items()
+            ]
+            connection.executemany(
+                "INSERT INTO records (collection, key, position, kind, value)"
+                " VALUES (?, ?, ?, ?, ?) ON CONFLICT (collection, key) DO"
+                " UPDATE SET position = excluded.position, kind ="
+                " excluded.kind, value = excluded.value WHERE position !="
+                " excluded.position OR value != excluded.value",
+                rows,
+            )
+            # A partial write keeps the age of an existing collection.
+            connection.execute(
+                (
+                    "INSERT OR IGNORE INTO collections (collection,"
+                    " updated_at) VALUES (?, ?)"
+                    if partial
+                    else (
+                        "INSERT OR REPLACE INTO collections (collection,"
+                        " updated_at) VALUES (?, ?)"
+                    )
+                ),
+                (identifier, self.timestamps[identifier]),
+            )
+
+        return rows
+
+    def recover_records(self) -> None:
+        get_logger().warning(
+            "The cached records are corrupted. They will be discarded and"
+            " fetched again.",
+        )
+
+        # The journals are also removed, as they would be replayed on the
+        # new file.
+        path = self.get_records_path()
+        with records_lock:
+            stat = records_files.get(path, None)
+            close_records(path)
+
+            # The file is left alone when another run already replaced it.
+            with lock_folder(self.cache_folder):
+                if stat is not None and is_same_inode(path, stat):
+                    for suffix in RECORDS_SUFFIXES:
+                        path.with_name(path.name + suffix).unlink(
+                            missing_ok=True,
+                        )
+
+        for identifier, obj in list(self.cache.items()):
+            if isinstance(obj, CachedRecords) and obj.path is not None:
+                self.cache.pop(identifier, None)
+                self.timestamps.pop(identifier, None)
+
+    def update_schemas(self, connection: sqlite3.Connection) -> None:
+        stored_schemas = get_stored_schemas(connection)
+        if stored_schemas == SCHEMAS:
+            return
+
+        # The records written with other members of the facades are fetched
+        # again, instead of mixing both schemas.
+        if stored_schemas:
             get_logger().info(
-                f'The object "{identifier}" were dumped into the cache file.',
+                "The members of the facades changed, so the cached records"
+                " were discarded.",
             )
 
+            connection.execute("DELETE FROM records")
+            connection.execute("DELETE FROM collections")
+
+        connection.execute("DELETE FROM schemas")
+        connection.executemany(
+            "INSERT INTO schemas (facade, members) VALUES (?, ?)",
+            [
+                (facade, json.dumps(members))
+                for facade, members in SCHEMAS.items()
+            ],
+        )
+
+    def get_cached_records(self, identifier: str) -> CachedRecords | None:
+        records = self.load_records(identifier)
+        count_lookup(identifier, found=records is not None)
+
+        return records
+
+    def load_records(self, identifier: str) -> CachedRecords | None:
+        # Get from in-memory cache
+        records = self.cache.get(identifier, None)
+        if isinstance(records, CachedRecords):
+            return records
+
+        if self.disabled:
+            return None
+
+        # Get from the file-based cache
+        path = self.get_records_path()
+        if not path.exists():
+            return None
+
+        collection = self.read_collection(path, identifier)
+        if collection is None:
+            return None
+
+        timestamp, decoder = collection
+        records = CachedRecords(identifier, path, decoder=decoder)
+
+        self.cache[identifier] = records
+        self.timestamps[identifier] = timestamp
+
+        get_logger().info(
+            f'The collection "{identifier}" was opened from the cache.',
+        )
+
+        return records
+
+    def read_collection(
+        self,
+        path: Path,
+        identifier: str,
+    ) -> tuple[float, Decoder] | None:
+        try:
+            with connect_records(path) as connection:
+                row = connection.execute(
+                    "SELECT updated_at FROM collections WHERE collection = ?",
+                    (identifier,),
+                ).fetchone()
+
+                if row is None:
+                    return None
+
+                return row[0], Decoder(get_stored_schemas(connection))
+        except CorruptedCacheError:
+            self.recover_records()
+
+            return None
+        except IncompatibleCacheError:
+            get_logger().warning(
+                f'The collection "{identifier}" was cached with incompatible'
+                " facades. It will be fetched again.",
+            )
+
+            return None
+
+    def get_path(self, identifier: str) -> Path:
+        return Path(self.cache_folder).joinpath(
+            identifier + BACKUP_EXTENSION,
+        )
+
     def get_cached_object(self, identifier: str) -> typing.Any:
+        obj = self.load_object(identifier)
+        count_lookup(identifier, found=obj is not None)
+
+        return obj
+
+    def load_object(self, identifier: str) -> typing.Any:
         # Get from in-memory cache
         obj = self.cache.get(identifier, None)
         if obj is not None:
@@ -70,26 +689,188 @@ class Cache(metaclass=Singleton):
         if self.disabled:
             return None
 
-        # Get from the file-based cache
-        path = Path(self.cache_folder).joinpath(
-            identifier + BACKUP_EXTENSION,
+        # Get from the file-based cache, after the pending writes and
+        # removals of the other runs
+        path = self.get_path(identifier)
+        with lock_folder(self.cache_folder, shared=True):
+            try:
+                with path.open(mode="rb") as file:
+                    data = file.read()
+                    stat = os.fstat(file.fileno())
+            except FileNotFoundError:
+                return None
+
+        count("cache.bytes_read", len(data))
+
+        try:
+            with span("cache.decode"):
+                obj = decode_document(data)
+        except CorruptedCacheError:
+            get_logger().warning(
+                f'The object "{identifier}" is corrupted. It will be discarded'
+                " and fetched again.",
+            )
+
+            self.discard_file(path, stat)
+
+            return None
+        except IncompatibleCacheError:
+            get_logger().warning(
+                f'The object "{identifier}" was cached in an incompatible'
+                " format. It will be fetched again.",
+            )
+
+            return None
+
+        self.cache[identifier] = obj
+        self.timestamps[identifier] = stat.st_mtime
+
+        get_logger().info(
+            f'The object "{identifier}" was read from the cache.',
+        )
+
+        return obj
+
+    def discard_file(self, path: Path, stat: os.stat_result) -> None:
+        # The file is kept if another run replaced it in the meantime.
+        with lock_folder(self.cache_folder):
+            if is_same_file(path, stat):
+                path.unlink()
+
+    def is_expired(self, identifier: str) -> bool:
+        # The TTLs are set by the keys shared by all the namespaces.
+        ttl = self.ttls.get(
+            identifier,
+            self.ttls.get(get_base_identifier(identifier), self.default_ttl),
+        )
+        timestamp = self.timestamps.get(identifier, None)
+
+        if ttl is None or timestamp is None:
+            return False
+
+        return time.time() - timestamp > ttl
+
+    def get_identifiers(self) -> set[str]:
+        identifiers = set(self.cache.keys())
+        if self.disabled:
+            return identifiers
+
+        identifiers.update(
+            path.stem
+            for path in Path(self.cache_folder).glob("*" + BACKUP_EXTENSION)
         )
 
+        path = self.get_records_path()
         if not path.exists():
-            return None
+            return identifiers
+
+        try:
+            with connect_records(path) as connection:
+                identifiers.update(
+                    collection
+                    for (collection,) in connection.execute(
+                        "SELECT collection FROM collections",
+                    )
+                )
+        except CorruptedCacheError:
+            self.recover_records()
+
+        return identifiers
 
-        with path.open(
-            mode="rb",
-        ) as file:
-            obj = pickle.loads(file.read())
+    def invalidate(self, identifier: str | None = None) -> None:
+        identifiers = self.get_identifiers()
+        if identifier is not None:
+            # A key invalidates the objects cached under it by all the
+            # namespaces.
+            identifiers = {identifier} | {
+                current_identifier
+                for current_identifier in identifiers
+                if get_base_identifier(current_identifier) == identifier
+            }
 
-            self.cache[identifier] = obj
+        if not self.disabled:
+            with lock_folder(self.cache_folder):
+                for current_identifier in identifiers:
+                    self.get_path(current_identifier).unlink(missing_ok=True)
+
+                # The temporary files left by the crashed runs are removed,
+                # while no write is in progress.
+                if identifier is None:
+                    for path in Path(self.cache_folder).glob(
+                        "*" + TEMPORARY_EXTENSION,
+                    ):
+                        path.unlink(missing_ok=True)
+
+        for current_identifier in identifiers:
+            self.cache.pop(current_identifier, None)
+            self.timestamps.pop(current_identifier, None)
+
+            if not self.disabled:
+                self.delete_records(current_identifier)
 
             get_logger().info(
-                f'The object "{identifier}" was read from the cache.',
+                f'The object "{current_identifier}" was invalidated.',
             )
 
-            return obj
+    def delete_records(self, identifier: str) -> None:
+        path = self.get_records_path()
+        if not path.exists():
+            return
+
+        try:
+            with connect_records(path) as connection:
+                connection.execute(
+                    "DELETE FROM records WHERE collection = ?",
+                    (identifier,),
+                )
+                connection.execute(
+                    "DELETE FROM collections WHERE collection = ?",
+                    (identifier,),
+                )
+        except CorruptedCacheError:
+            self.recover_records()
+
+    def revalidate(
+        self,
+        identifier: str,
+        refresh: typing.Callable[[], typing.Any],
+    ) -> None:
+        # The stale object is still served until the refresh, which is
+        # responsible for caching the new object, completes.
+        def run_refresh() -> None:
+            try:
+                refresh()
+            except Exception:  # noqa: BLE001
+                get_logger().warning(
+                    f'The object "{identifier}" could not be refreshed.',
+                    exc_info=True,
+                )
+            finally:
+                # The object can be refreshed again once it expires anew.
+                with self.revalidations_lock:
+                    self.revalidations.pop(identifier, None)
+
+        with self.revalidations_lock:
+            if identifier in self.revalidations:
+                return
+
+            get_logger().info(
+                f'The object "{identifier}" expired and will be refreshed.',
+            )
+
+            thread = threading.Thread(target=run_refresh)
+            self.revalidations[identifier] = thread
+            thread.start()
+
+    def wait_for_revalidations(self) -> None:
+        with self.revalidations_lock:
+            threads = list(self.revalidations.values())
+
+        for thread in threads:
+            thread.join()
+
+    def close(self) -> None:
+        close_records()
 
 
 class UnspecifiedCacheFolderError(GitPortfolioError):
@@ -1,59 +1,227 @@
 from __future__ import annotations
 
+import hashlib
 import os
 import shutil
+import threading
 import typing
+from dataclasses import dataclass, field
 from pathlib import Path
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader  # type: ignore[assignment]
+
 from gitportfolio.exceptions import GitPortfolioError
+from gitportfolio.facade import intern_strings
 from gitportfolio.filters import RepositoryFacadePrivateFilter, filter_repos
 from gitportfolio.helpers import Singleton
 from gitportfolio.logger import get_logger
+from gitportfolio.tracing import span
 
 if typing.TYPE_CHECKING:
     from gitportfolio.facade import OrganisationFacade, RepositoryFacade
 
 
+# The tags are shared by all the repositories with the same settings, so they
+# are immutable.
+DEFAULT_REPO_SETTINGS = {"shown": True, "tags": ()}
+DEFAULT_ACCOUNT_NAME = "default"
+DEFAULT_TOKEN_VARIABLE = "GITHUB_PAT"  # noqa: S105
+TOKEN_DIGEST_LENGTH = 12
+NAMESPACE_DIGEST_SEPARATOR = "-"
+
+
+@dataclass(frozen=True, slots=True)
+class Account:
+    name: str
+    token_variable: str = DEFAULT_TOKEN_VARIABLE
+    token: str | None = field(default=None, repr=False)
+
+    def get_token(self) -> str:
+        if not self.token:
+            raise AccountTokenNotSetError(self.token_variable)
+
+        return self.token
+
+    @property
+    def namespace(self) -> str:
+        # The scopes of a token are only known after a request, so the cached
+        # objects are separated by a digest of the token itself.
+        digest = hashlib.sha256(self.get_token().encode()).hexdigest()
+
+        return f"{self.name}{NAMESPACE_DIGEST_SEPARATOR}" + (
+            digest[:TOKEN_DIGEST_LENGTH]
+        )
+
+
 class Configuration(metaclass=Singleton):
     filename: str
-    config: dict
-    github_pat: str
+    overrides: dict[str, dict[str, typing.Any]]
+    _config: dict | None
+    _accounts: list[Account] | None
+    _repos_settings: dict[str, dict[str, typing.Any]] | None
+    _excluded_orgs: frozenset[str] | None
+    _lock: threading.RLock
 
     def __init__(self, filename: str = "") -> None:
         if getattr(self, "filename", None) is None and filename is None:
             raise ConfigurationPathNotSpecifiedError
 
+        # The configuration and the tokens are only read when first used.
         self.filename = filename
-        self.config = self._read_config(filename)
-        self.github_pat = self._get_github_pat()
+        self.overrides = {}
+        self._config = None
+        self._accounts = None
+        self._repos_settings = None
+        self._excluded_orgs = None
+        self._lock = threading.RLock()
+
+    @property
+    def config(self) -> dict:
+        if self._config is None:
+            with self._lock:
+                if self._config is None:
+                    self._config = self._read_config(self.filename)
+
+        return self._config
 
     def _read_config(self, filename: str) -> dict:
-        with Path(filename).open(mode="r", encoding="utf-8") as file:
-            configuration = yaml.safe_load(file.read())
+        with Path(filename).open(
+            mode="r",
+            encoding="utf-8",
+        ) as file, span("config.read"):
+            # An empty file is loaded as None, which would be read again on
+            # each access.
+            configuration = yaml.load(file.read(), Loader=SafeLoader) or {}
 
             get_logger().info("The configuration was read.")
 
             return configuration
 
-    def _get_github_pat(self) -> str:
-        pat = os.environ.get("GITHUB_PAT", None)
+    def get_config(self) -> dict:
+        return self.config
+
+    def _read_accounts(self) -> list[Account]:
+        # The tokens are only required when the data is fetched from GitHub,
+        # and not when it is served from the cache.
+        accounts_config = self.config.get("accounts", None) or {}
+        if not accounts_config:
+            return [
+                Account(
+                    DEFAULT_ACCOUNT_NAME,
+                    DEFAULT_TOKEN_VARIABLE,
+                    os.environ.get(DEFAULT_TOKEN_VARIABLE, None),
+                ),
+            ]
+
+        accounts = []
+        for name, account_config in accounts_config.items():
+            variable = (account_config or {}).get(
+                "token_variable",
+                DEFAULT_TOKEN_VARIABLE,
+            )
+
+            accounts.append(
+                Account(str(name), variable, os.environ.get(variable, None)),
+            )
+
+        get_logger().info(f"{len(accounts)} accounts were configured.")
+
+        return accounts
+
+    def get_accounts(self) -> list[Account]:
+        if self._accounts is None:
+            with self._lock:
+                if self._accounts is None:
+                    self._accounts = self._read_accounts()
+
+        return self._accounts
+
+    def _compile_indexes(self) -> None:
+        with self._lock:
+            if self._repos_settings is not None:
+                return
+
+            config = self.config
+
+            orgs_config = config.get("orgs", None) or {}
+            self._excluded_orgs = frozenset(
+                login
+                for login, org_config in orgs_config.items()
+                if (org_config or {}).get("excluded", False)
+            )
+
+            repos_config = config.get("repos", None) or {}
+            repos_settings = {}
+            for name, repo_config in repos_config.items():
+                settings = {**DEFAULT_REPO_SETTINGS, **(repo_config or {})}
+                settings["tags"] = tuple(
+                    intern_strings(settings["tags"] or []),
+                )
+
+                repos_settings[name] = settings
 
-        if not pat:
-            raise GitHubPatNotSetError
+            self._repos_settings = repos_settings
 
-        get_logger().info(
-            "The GitHub personal access token was found.",
+    def _reset_indexes(self) -> None:
+        with self._lock:
+            self._repos_settings = None
+            self._excluded_orgs = None
+
+    def reload(self) -> None:
+        # The configuration is read again when next used, while the
+        # overrides are kept.
+        with self._lock:
+            self._config = None
+            self._accounts = None
+            self._reset_indexes()
+
+        get_logger().info("The configuration will be read again.")
+
+    def get_repo_settings(self, name: str) -> dict[str, typing.Any]:
+        if self._repos_settings is None:
+            self._compile_indexes()
+
+        return self._repos_settings.get(  # type: ignore[union-attr]
+            name,
+            DEFAULT_REPO_SETTINGS,
         )
 
-        return pat
+    def is_org_excluded(self, login: str) -> bool:
+        if self._excluded_orgs is None:
+            self._compile_indexes()
 
-    def get_config(self) -> dict:
-        return self.config
+        return login in self._excluded_orgs  # type: ignore[operator]
+
+    def get_setting(
+        self,
+        section: str,
+        key: str,
+        default: typing.Any = None,
+    ) -> typing.Any:
+        override = self.overrides.get(section, {}).get(key, None)
+        if override is not None:
+            return override
 
-    def get_github_pat(self) -> str:
-        return self.github_pat
+        section_config = self.config.get(section, None) or {}
+
+        return section_config.get(key, default)
+
+    def override_setting(
+        self,
+        section: str,
+        key: str,
+        value: typing.Any,
+    ) -> None:
+        # The overrides are not saved into the configuration file.
+        if value is None:
+            return
+
+        self.overrides.setdefault(section, {})[key] = value
 
     def get_orgs_not_in_config(
         self,
@@ -61,8 +229,9 @@ class Configuration(metaclass=Singleton):
     ) -> typing.Generator[OrganisationFacade, None, None]:
         for org in orgs:
             if org.login not in self.config["orgs"]:
-                get_logger().warn(
-                    f'The organisation "{org.login}" is not configured.',
+                get_logger().warning(
+                    'The organisation "%s" is not configured.',
+                    org.login,
                 )
 
                 yield org
@@ -78,8 +247,9 @@ class Configuration(metaclass=Singleton):
 
         for repo in public_repos:
             if repo.name not in self.config["repos"]:
-                get_logger().warn(
-                    f'The repository "{repo.name}" is not configured.',
+                get_logger().warning(
+                    'The repository "%s" is not configured.',
+                    repo.name,
                 )
 
                 yield repo
@@ -89,7 +259,7 @@ class Configuration(metaclass=Singleton):
         from gitportfolio.github import get_orgs, get_repos
 
         orgs = list(get_orgs())
-        repos = list(get_repos(orgs))
+        repos = list(get_repos())
 
         updates = 0
 
@@ -109,6 +279,9 @@ class Configuration(metaclass=Singleton):
 
             updates += 1
 
+        if updates > 0:
+            self._reset_indexes()
+
         if save and updates > 0:
             backup_filename = self.filename + ".bak"
             shutil.copyfile(self.filename, backup_filename)
@@ -128,3 +301,7 @@ class ConfigurationPathNotSpecifiedError(GitPortfolioError):
 
 class GitHubPatNotSetError(GitPortfolioError):
     """The GITHUB_PAT environment variable is not set."""
+
+
+class AccountTokenNotSetError(GitHubPatNotSetError):
+    """The environment variable with the token of an account is not set."""
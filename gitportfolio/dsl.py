@@ -1,55 +1,353 @@
+import functools
+import hashlib
 import importlib
+import importlib.metadata
+import inspect
 import re
 import sys
+import threading
 import typing
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone
+from pathlib import Path
 
+from gitportfolio.cache import Cache
+from gitportfolio.config import Configuration
 from gitportfolio.exceptions import GitPortfolioError
 from gitportfolio.facade import OrganisationFacade, RepositoryFacade
 from gitportfolio.filters import RepositoryFacadePrivateFilter, filter_repos
-from gitportfolio.formatter import to_list, to_repo_table
+from gitportfolio.formatter import (
+    DEFAULT_REPO_TABLE_COLUMNS,
+    to_list,
+    to_repo_table,
+)
 from gitportfolio.github import get_orgs, get_repos
 from gitportfolio.logger import get_logger
+from gitportfolio.serialization import UnserializableObjectError, dumps
+from gitportfolio.table import RepositoryTable
+from gitportfolio.tracing import count, span
+
+PLACEHOLDER_PATTERN = re.compile(r"<!-- gitportfolio: ([a-zA-Z_|]+) -->")
+DEFAULT_RENDER_WORKERS = 4
+RENDERS_CACHE_KEY = "renders"
+BUILTIN_DATA_SOURCES = frozenset(
+    (
+        "now",
+        "get_orgs",
+        "get_repos",
+        "get_public_repos",
+        "get_private_repos",
+    ),
+)
+REPOS_INDEPENDENT_DATA_SOURCES = frozenset(("now", "get_orgs"))
+PACKAGE_NAME = "githubportfolio"
+FORMATTING_MODULES = ("gitportfolio.formatter", __name__)
+MAX_COMPILED_TEMPLATES = 32
+
+
+class Segment(typing.NamedTuple):
+    text: str
+    query: str | None
+
+
+Template = tuple[Segment, ...]
+
+
+@functools.lru_cache(maxsize=MAX_COMPILED_TEMPLATES)
+def compile_template(text: str) -> Template:
+    # The templates are compiled once per content, for example when rendered
+    # into several outputs, while the previous contents of the templates
+    # edited in the watch mode are eventually evicted.
+    segments = []
+    position = 0
+    for match in PLACEHOLDER_PATTERN.finditer(text):
+        segments.append(Segment(text[position : match.start()], match[1]))
+
+        position = match.end()
+
+    if position < len(text):
+        segments.append(Segment(text[position:], None))
+
+    template = tuple(segments)
+
+    get_logger().info(
+        f"A template was compiled into {len(template)} segments.",
+    )
 
+    return template
 
-def get_data_from_source(
-    data_source_name: str,
-) -> list[OrganisationFacade | RepositoryFacade | datetime]:
-    get_logger().info(f'The data source "{data_source_name}" will be queried.')
 
-    orgs = list(get_orgs())
+def get_data_source_names(template: Template) -> set[str]:
+    return {
+        segment.query.partition("|")[0]
+        for segment in template
+        if segment.query is not None
+    }
+
+
+@functools.cache
+def get_version() -> str:
+    try:
+        return importlib.metadata.version(PACKAGE_NAME)
+    except importlib.metadata.PackageNotFoundError:
+        return ""
+
 
+@functools.cache
+def get_formatting_digest() -> bytes:
+    # The formatters may change between versions, and between the commits of
+    # the same version, so their outputs are only reused by the same code.
+    digest = hashlib.sha256(get_version().encode())
+    for name in FORMATTING_MODULES:
+        digest.update(Path(sys.modules[name].__file__ or "").read_bytes())
+
+    return digest.digest()
+
+
+def compute_fingerprint(data: typing.Any) -> str | None:
+    with span("renders.fingerprint"):
+        try:
+            encoded_data = dumps(data)
+        except UnserializableObjectError:
+            return None
+
+        fingerprint = hashlib.sha256(get_formatting_digest())
+        fingerprint.update(encoded_data)
+
+        return fingerprint.hexdigest()
+
+
+class EvaluationContext:
+    orgs: list[OrganisationFacade] | None
+    repos: list[RepositoryFacade] | None
+    table: RepositoryTable | None
+    data: dict[str, typing.Any]
+    fingerprints: dict[str, str | None]
+    outputs: dict[str, tuple[str, str]]
+    cache_outputs: bool
+    lock: threading.RLock
+    data_locks: dict[str, threading.Lock]
+    data_locks_lock: threading.Lock
+    outputs_lock: threading.Lock
+
+    def __init__(self, *, cache_outputs: bool = True) -> None:
+        self.orgs = None
+        self.repos = None
+        self.table = None
+        self.data = {}
+        self.fingerprints = {}
+        self.outputs = {}
+        self.cache_outputs = cache_outputs
+        self.lock = threading.RLock()
+        self.data_locks = {}
+        self.data_locks_lock = threading.Lock()
+        self.outputs_lock = threading.Lock()
+
+    def get_data_lock(self, data_source_name: str) -> threading.Lock:
+        # The locks of the data sources and of the outputs are distinct from
+        # the lock of the shared data, which is held while it is fetched.
+        with self.data_locks_lock:
+            return self.data_locks.setdefault(
+                data_source_name,
+                threading.Lock(),
+            )
+
+    def get_orgs(self) -> list[OrganisationFacade]:
+        with self.lock:
+            if self.orgs is None:
+                self.orgs = list(get_orgs())
+
+            return self.orgs
+
+    def get_repos(self) -> list[RepositoryFacade]:
+        with self.lock:
+            if self.repos is None:
+                self.repos = list(get_repos())
+
+            return self.repos
+
+    def get_repo_table(self) -> RepositoryTable:
+        with self.lock:
+            if self.table is None:
+                self.table = RepositoryTable(self.get_repos())
+
+            return self.table
+
+    def get_fingerprint(
+        self,
+        data_source_name: str,
+        data: typing.Any,
+    ) -> str | None:
+        with self.get_data_lock(data_source_name):
+            if data_source_name not in self.fingerprints:
+                self.fingerprints[data_source_name] = compute_fingerprint(
+                    data,
+                )
+
+            return self.fingerprints[data_source_name]
+
+    def invalidate(
+        self,
+        data_source_names: typing.Iterable[str] | None = None,
+    ) -> None:
+        with self.lock:
+            if data_source_names is None:
+                self.orgs = None
+                self.repos = None
+                self.table = None
+                data_source_names = list(self.data)
+
+            for name in data_source_names:
+                self.data.pop(name, None)
+                self.fingerprints.pop(name, None)
+
+    def update_repo(
+        self,
+        full_name: str,
+        repo: RepositoryFacade | None,
+    ) -> None:
+        with self.lock:
+            if self.repos is None:
+                return
+
+            # The repository keeps its position, or is removed when it is not
+            # shown anymore.
+            repos = list(self.repos)
+            position = next(
+                (
+                    index
+                    for index, current_repo in enumerate(repos)
+                    if current_repo.full_name == full_name
+                ),
+                None,
+            )
+            if position is None:
+                if repo is not None:
+                    repos.append(repo)
+            elif repo is None:
+                del repos[position]
+            else:
+                repos[position] = repo
+
+            self.repos = repos
+            self.table = None
+            self.invalidate(
+                [
+                    name
+                    for name in self.data
+                    if name not in REPOS_INDEPENDENT_DATA_SOURCES
+                ],
+            )
+
+    def add_output(self, query: str, fingerprint: str, output: str) -> None:
+        with self.outputs_lock:
+            self.outputs[query] = (fingerprint, output)
+
+    def save_outputs(self) -> None:
+        with self.outputs_lock:
+            outputs, self.outputs = self.outputs, {}
+
+        if outputs:
+            Cache().cache_records(RENDERS_CACHE_KEY, outputs, partial=True)
+
+
+def compute_data_from_source(
+    data_source_name: str,
+    context: EvaluationContext,
+) -> list[OrganisationFacade | RepositoryFacade | datetime]:
     data: typing.Any = None
     if data_source_name == "now":
         data = datetime.now(tz=timezone.utc)
     elif data_source_name == "get_orgs":
-        data = orgs
+        data = context.get_orgs()
     elif data_source_name == "get_repos":
-        data = get_repos(orgs)
+        data = context.get_repos()
     elif data_source_name == "get_public_repos":
-        repos = list(get_repos(orgs))
         data = filter_repos(
-            repos,
+            context.get_repos(),
             RepositoryFacadePrivateFilter(is_private=False),
         )
     elif data_source_name == "get_private_repos":
-        repos = list(get_repos(orgs))
         data = filter_repos(
-            repos,
+            context.get_repos(),
             RepositoryFacadePrivateFilter(is_private=True),
         )
     else:
         try:
             module = importlib.import_module(data_source_name)
 
-            repos = list(get_repos(orgs))
-            data = getattr(module, data_source_name)(orgs, repos)
+            function = getattr(module, data_source_name)
         except (ImportError, AttributeError) as e:
             raise CustomFunctionNotImplementedError from e
 
+        # The columnar table is only built for the data sources asking for
+        # it, and then shared by all of them.
+        arguments = {}
+        if "table" in inspect.signature(function).parameters:
+            arguments["table"] = context.get_repo_table()
+
+        # The lists are copied as custom data sources may sort them in place.
+        data = function(
+            list(context.get_orgs()),
+            list(context.get_repos()),
+            **arguments,
+        )
+
     return data
 
 
+def get_data_from_source(
+    data_source_name: str,
+    context: EvaluationContext | None = None,
+) -> list[OrganisationFacade | RepositoryFacade | datetime]:
+    if context is None:
+        context = EvaluationContext()
+
+    # Placeholders evaluated concurrently wait for the same data source to be
+    # computed only once.
+    with context.get_data_lock(data_source_name):
+        if data_source_name in context.data:
+            get_logger().info(
+                f'The data source "{data_source_name}" was already queried.',
+            )
+
+            return context.data[data_source_name]
+
+        get_logger().info(
+            f'The data source "{data_source_name}" will be queried.',
+        )
+
+        with span(f"datasource.{data_source_name}"):
+            data = compute_data_from_source(data_source_name, context)
+
+        context.data[data_source_name] = data
+
+        return data
+
+
+def get_operation_options(operation: str) -> dict[str, typing.Any]:
+    if operation != "to_repo_table":
+        return {}
+
+    configuration = Configuration()
+
+    return {
+        "columns": list(
+            configuration.get_setting(
+                "rendering",
+                "table_columns",
+                DEFAULT_REPO_TABLE_COLUMNS,
+            ),
+        ),
+        "limit": configuration.get_setting("rendering", "table_limit", None),
+        "page_size": configuration.get_setting(
+            "rendering",
+            "table_page_size",
+            None,
+        ),
+    }
+
+
 def apply_operation(
     data: list[OrganisationFacade | RepositoryFacade | datetime],
     operation: str,
@@ -78,41 +376,135 @@ def apply_operation(
         if type(data[0]) is not RepositoryFacade:
             raise IncompatibleFormatterError
 
-        return to_repo_table(data)  # type: ignore[arg-type]
+        return to_repo_table(
+            data,  # type: ignore[arg-type]
+            **get_operation_options(operation),
+        )
 
     raise UnknownOperationError
 
 
+def apply_cached_operation(
+    query: str,
+    data_source_name: str,
+    data: typing.Any,
+    operation: str,
+    context: EvaluationContext,
+) -> str:
+    fingerprint = context.get_fingerprint(data_source_name, data)
+    if fingerprint is None:
+        return apply_operation(data, operation)
+
+    # The options of the formatter change its output as well.
+    options = get_operation_options(operation)
+    if options:
+        fingerprint = typing.cast(
+            str,
+            compute_fingerprint([fingerprint, options]),
+        )
+
+    # The outputs are cached by query, along with the fingerprint of the data
+    # they were formatted from.
+    cached_outputs = Cache().get_cached_records(RENDERS_CACHE_KEY)
+    cached_output = cached_outputs.get(query) if cached_outputs else None
+    if cached_output is not None and cached_output[0] == fingerprint:
+        get_logger().info(
+            f'The output of the query "{query}" was reused from the cache.',
+        )
+        count("renders.hits")
+
+        return cached_output[1]
+
+    count("renders.misses")
+
+    output = apply_operation(data, operation)
+    context.add_output(query, fingerprint, output)
+
+    return output
+
+
 def parse_single_query(
     query: str,
+    context: EvaluationContext | None = None,
 ) -> str:
     if query.count("|") != 1:
         raise DSLSyntaxError
 
+    if context is None:
+        context = EvaluationContext()
+
     data_source, operation = query.split("|")
 
     get_logger().info(f'The query "{query}" will be evaluated.')
 
-    data = get_data_from_source(data_source)
+    data = get_data_from_source(data_source, context)
 
-    return apply_operation(data, operation)
+    with span(f"formatter.{operation}"):
+        if not context.cache_outputs:
+            return apply_operation(data, operation)
+
+        return apply_cached_operation(
+            query,
+            data_source,
+            data,
+            operation,
+            context,
+        )
 
 
-def parse(custom_datasources_folder: str, text: str) -> str:
+def render(
+    custom_datasources_folder: str,
+    text: str,
+    context: EvaluationContext | None = None,
+) -> typing.Generator[str, None, None]:
     get_logger().info("A parametrised text will be parsed.")
 
-    sys.path.append(custom_datasources_folder)
+    if custom_datasources_folder not in sys.path:
+        sys.path.append(custom_datasources_folder)
 
-    def replace_by_parsing(match: re.Match) -> str:
-        query = match.group(1)
+    # The data sources are computed once and shared by all placeholders.
+    if context is None:
+        context = EvaluationContext()
 
-        return parse_single_query(query)
+    template = compile_template(text)
 
-    return re.sub(
-        r"<!-- gitportfolio: ([a-zA-Z_|]+) -->",
-        replace_by_parsing,
-        text,
+    workers = Configuration().get_setting(
+        "rendering",
+        "workers",
+        DEFAULT_RENDER_WORKERS,
     )
+    executor = ThreadPoolExecutor(max_workers=max(1, int(workers)))
+
+    try:
+        # The distinct queries are evaluated concurrently, while the segments
+        # are yielded in the order of the template.
+        results: dict[str, Future[str]] = {}
+        for segment in template:
+            if segment.query is not None and segment.query not in results:
+                results[segment.query] = executor.submit(
+                    parse_single_query,
+                    segment.query,
+                    context,
+                )
+
+        for segment in template:
+            if segment.text:
+                yield segment.text
+
+            if segment.query is not None:
+                yield results[segment.query].result()
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+    context.save_outputs()
+
+
+def parse(
+    custom_datasources_folder: str,
+    text: str,
+    context: EvaluationContext | None = None,
+) -> str:
+    return "".join(render(custom_datasources_folder, text, context))
 
 
 class DSLSyntaxError(GitPortfolioError):
@@ -1,8 +1,16 @@
-from dataclasses import asdict, dataclass
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass, fields
 from datetime import datetime
+from typing import Iterable
+
 
+def intern_strings(values: Iterable[str]) -> list[str]:
+    return [sys.intern(value) for value in values]
 
-@dataclass
+
+@dataclass(slots=True)
 class RepositoryFacade:
     name: str
     description: str
@@ -17,18 +25,29 @@ class RepositoryFacade:
     is_archived: bool
     is_shown: bool
 
+    def __post_init__(self) -> None:
+        # The owners, languages and tags are repeated across repositories, so
+        # they share the same string objects.
+        self.owner = sys.intern(self.owner)
+        self.languages = intern_strings(self.languages)
+        self.tags = intern_strings(self.tags)
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.owner}/{self.name}"
+
     @property
     def link(self) -> str:
         return f"https://github.com/{self.owner}/{self.name}"
 
     def as_array(self) -> list:
-        return list(asdict(self).values())
+        return [getattr(self, name) for name in REPOSITORY_MEMBERS]
 
     def as_dict(self) -> dict:
-        return asdict(self)
+        return {name: getattr(self, name) for name in REPOSITORY_MEMBERS}
 
 
-@dataclass
+@dataclass(slots=True)
 class OrganisationFacade:
     name: str
     login: str
@@ -37,3 +56,6 @@ class OrganisationFacade:
     @property
     def link(self) -> str:
         return f"https://github.com/{self.login}"
+
+
+REPOSITORY_MEMBERS = tuple(field.name for field in fields(RepositoryFacade))
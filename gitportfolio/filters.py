@@ -1,19 +1,119 @@
 from __future__ import annotations
 
 from abc import abstractmethod
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable
 
 from gitportfolio.logger import get_logger
 
 if TYPE_CHECKING:
     from gitportfolio.facade import RepositoryFacade
 
+RepositoryFacadePredicate = Callable[["RepositoryFacade"], bool]
+
 
 class RepositoryFacadeFilter:
+    predicate: RepositoryFacadePredicate | None = None
+
     @abstractmethod
-    def is_accepted(self, repo: RepositoryFacade) -> bool:
+    def to_predicate(self) -> RepositoryFacadePredicate:
         raise NotImplementedError
 
+    def is_accepted(self, repo: RepositoryFacade) -> bool:
+        # The filter is compiled once, on the first repository.
+        if self.predicate is None:
+            self.predicate = self.to_predicate()
+
+        return self.predicate(repo)
+
+    def __and__(
+        self,
+        other: RepositoryFacadeFilter,
+    ) -> RepositoryFacadeAndFilter:
+        return RepositoryFacadeAndFilter(self, other)
+
+    def __or__(
+        self,
+        other: RepositoryFacadeFilter,
+    ) -> RepositoryFacadeOrFilter:
+        return RepositoryFacadeOrFilter(self, other)
+
+    def __invert__(self) -> RepositoryFacadeNotFilter:
+        return RepositoryFacadeNotFilter(self)
+
+
+class RepositoryFacadeAndFilter(RepositoryFacadeFilter):
+    filters: list[RepositoryFacadeFilter]
+
+    def __init__(self, *filters: RepositoryFacadeFilter) -> None:
+        # Nested conjunctions are flattened into a single one.
+        self.filters = []
+        for custom_filter in filters:
+            if isinstance(custom_filter, RepositoryFacadeAndFilter):
+                self.filters.extend(custom_filter.filters)
+            else:
+                self.filters.append(custom_filter)
+
+    def to_predicate(self) -> RepositoryFacadePredicate:
+        predicates = [
+            custom_filter.to_predicate() for custom_filter in self.filters
+        ]
+
+        if len(predicates) == 1:
+            return predicates[0]
+
+        if len(predicates) == 2:  # noqa: PLR2004
+            first, second = predicates
+
+            return lambda repo: first(repo) and second(repo)
+
+        def is_accepted(repo: RepositoryFacade) -> bool:
+            return all(predicate(repo) for predicate in predicates)
+
+        return is_accepted
+
+
+class RepositoryFacadeOrFilter(RepositoryFacadeFilter):
+    filters: list[RepositoryFacadeFilter]
+
+    def __init__(self, *filters: RepositoryFacadeFilter) -> None:
+        # Nested disjunctions are flattened into a single one.
+        self.filters = []
+        for custom_filter in filters:
+            if isinstance(custom_filter, RepositoryFacadeOrFilter):
+                self.filters.extend(custom_filter.filters)
+            else:
+                self.filters.append(custom_filter)
+
+    def to_predicate(self) -> RepositoryFacadePredicate:
+        predicates = [
+            custom_filter.to_predicate() for custom_filter in self.filters
+        ]
+
+        if len(predicates) == 1:
+            return predicates[0]
+
+        if len(predicates) == 2:  # noqa: PLR2004
+            first, second = predicates
+
+            return lambda repo: first(repo) or second(repo)
+
+        def is_accepted(repo: RepositoryFacade) -> bool:
+            return any(predicate(repo) for predicate in predicates)
+
+        return is_accepted
+
+
+class RepositoryFacadeNotFilter(RepositoryFacadeFilter):
+    custom_filter: RepositoryFacadeFilter
+
+    def __init__(self, custom_filter: RepositoryFacadeFilter) -> None:
+        self.custom_filter = custom_filter
+
+    def to_predicate(self) -> RepositoryFacadePredicate:
+        predicate = self.custom_filter.to_predicate()
+
+        return lambda repo: not predicate(repo)
+
 
 class RepositoryFacadeOwnerFilter(RepositoryFacadeFilter):
     owner: str
@@ -23,10 +123,13 @@ class RepositoryFacadeOwnerFilter(RepositoryFacadeFilter):
         self.owner = owner
         self.inverse = inverse
 
-    def is_accepted(self, repo: RepositoryFacade) -> bool:
-        same = repo.owner == self.owner
+    def to_predicate(self) -> RepositoryFacadePredicate:
+        owner = self.owner
+
+        if self.inverse:
+            return lambda repo: repo.owner != owner
 
-        return same if not self.inverse else not same
+        return lambda repo: repo.owner == owner
 
 
 class RepositoryFacadeArchivedFilter(RepositoryFacadeFilter):
@@ -35,8 +138,10 @@ class RepositoryFacadeArchivedFilter(RepositoryFacadeFilter):
     def __init__(self, *, is_archived: bool) -> None:
         self.is_archived = is_archived
 
-    def is_accepted(self, repo: RepositoryFacade) -> bool:
-        return repo.is_archived == self.is_archived
+    def to_predicate(self) -> RepositoryFacadePredicate:
+        is_archived = self.is_archived
+
+        return lambda repo: repo.is_archived == is_archived
 
 
 class RepositoryFacadePrivateFilter(RepositoryFacadeFilter):
@@ -45,8 +150,10 @@ class RepositoryFacadePrivateFilter(RepositoryFacadeFilter):
     def __init__(self, *, is_private: bool) -> None:
         self.is_private = is_private
 
-    def is_accepted(self, repo: RepositoryFacade) -> bool:
-        return repo.is_private == self.is_private
+    def to_predicate(self) -> RepositoryFacadePredicate:
+        is_private = self.is_private
+
+        return lambda repo: repo.is_private == is_private
 
 
 class RepositoryFacadeShownFilter(RepositoryFacadeFilter):
@@ -55,8 +162,10 @@ class RepositoryFacadeShownFilter(RepositoryFacadeFilter):
     def __init__(self, *, is_shown: bool) -> None:
         self.is_shown = is_shown
 
-    def is_accepted(self, repo: RepositoryFacade) -> bool:
-        return repo.is_shown == self.is_shown
+    def to_predicate(self) -> RepositoryFacadePredicate:
+        is_shown = self.is_shown
+
+        return lambda repo: repo.is_shown == is_shown
 
 
 class RepositoryFacadeForkFilter(RepositoryFacadeFilter):
@@ -65,31 +174,46 @@ class RepositoryFacadeForkFilter(RepositoryFacadeFilter):
     def __init__(self, *, is_fork: bool) -> None:
         self.is_fork = is_fork
 
-    def is_accepted(self, repo: RepositoryFacade) -> bool:
-        return repo.is_fork == self.is_fork
+    def to_predicate(self) -> RepositoryFacadePredicate:
+        is_fork = self.is_fork
+
+        return lambda repo: repo.is_fork == is_fork
 
 
 class RepositoryFacadeTagsFilter(RepositoryFacadeFilter):
-    tags: list[str]
+    tags: frozenset[str]
     inverse: bool
 
     def __init__(self, tags: list[str], *, inverse: bool = False) -> None:
-        self.tags = tags
+        self.tags = frozenset(tags)
         self.inverse = inverse
 
-    def is_accepted(self, repo: RepositoryFacade) -> bool:
-        is_in = any([tag in repo.tags for tag in self.tags])
+    def to_predicate(self) -> RepositoryFacadePredicate:
+        is_disjoint = self.tags.isdisjoint
+
+        if self.inverse:
+            return lambda repo: is_disjoint(repo.tags)
 
-        return is_in if not self.inverse else not is_in
+        return lambda repo: not is_disjoint(repo.tags)
 
 
 def filter_repos(
     repos: list[RepositoryFacade],
     custom_filter: RepositoryFacadeFilter,
+    *other_filters: RepositoryFacadeFilter,
 ) -> list[RepositoryFacade]:
+    if other_filters:
+        custom_filter = RepositoryFacadeAndFilter(
+            custom_filter,
+            *other_filters,
+        )
+
     get_logger().info(
         "A list of repositories will be filtered with"
         f" {custom_filter.__class__.__name__}.",
     )
 
-    return [repo for repo in repos if custom_filter.is_accepted(repo)]
+    # All filters are applied in a single pass.
+    predicate = custom_filter.to_predicate()
+
+    return [repo for repo in repos if predicate(repo)]
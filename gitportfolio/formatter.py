@@ -1,12 +1,14 @@
 from __future__ import annotations
 
+import itertools
 import typing
 
-from tabulate import tabulate
-
+from gitportfolio.exceptions import GitPortfolioError
 from gitportfolio.logger import get_logger
 
 if typing.TYPE_CHECKING:
+    from datetime import datetime
+
     from gitportfolio.facade import OrganisationFacade, RepositoryFacade
 
 
@@ -27,54 +29,135 @@ def tinify(text: str) -> str:
     return "<sup><sub>" + text + "</sub></sup>"
 
 
-def to_repo_table(repos: list[RepositoryFacade]) -> str:
+CELL_ESCAPES = str.maketrans({"|": "\\|", "\n": " ", "\r": ""})
+
+
+def escape_cell(text: str) -> str:
+    return text.translate(CELL_ESCAPES) if text else ""
+
+
+# The months are formatted once, as they are shared by many repositories.
+formatted_months: dict[tuple[int, int], str] = {}
+
+
+def format_month(date: datetime) -> str:
+    key = (date.year, date.month)
+
+    month = formatted_months.get(key, None)
+    if month is None:
+        month = formatted_months[key] = date.strftime("%b%%20%Y")
+
+    return month
+
+
+def format_identifier(repo: RepositoryFacade) -> str:
+    identifier = (
+        f"[`{repo.owner}/{repo.name}`]"
+        f"(https://github.com/{repo.owner}/{repo.name}) "
+    )
+    if repo.is_fork:
+        identifier += "🪞"
+    if repo.is_archived:
+        identifier += "📦"
+
+    return tinify(identifier)
+
+
+def format_description(repo: RepositoryFacade) -> str:
+    return tinify(escape_cell(trim_text(repo.description, 50)))
+
+
+def format_tags(repo: RepositoryFacade) -> str:
+    return tinify(" ".join([f"`#{escape_cell(tag)}`" for tag in repo.tags]))
+
+
+def format_languages(repo: RepositoryFacade) -> str:
+    return tinify(", ".join([escape_cell(name) for name in repo.languages]))
+
+
+def format_metadata(repo: RepositoryFacade) -> str:
+    creation_date = format_month(repo.creation_date)
+    last_push = format_month(repo.last_push)
+
+    return (
+        f"<img height='12px' alt='Created on: {creation_date}'"
+        " src='https://img.shields.io/badge/"
+        f"Created%20on-{creation_date}-black'/> "
+        f"<img height='12px' alt='Last push on: {last_push}'"
+        " src='https://img.shields.io/badge/"
+        f"Last%20push%20on-{last_push}-green'/> "
+        f"<img height='12px' alt='Stars: {repo.stars_count}'"
+        " src='https://img.shields.io/badge/"
+        f"Stars-{repo.stars_count}-yellow'/>"
+    )
+
+
+REPO_TABLE_COLUMNS: dict[
+    str,
+    tuple[str, typing.Callable[[RepositoryFacade], str]],
+] = {
+    "identifier": ("Identifier", format_identifier),
+    "description": ("Description", format_description),
+    "tags": ("Tags", format_tags),
+    "languages": ("Languages", format_languages),
+    "metadata": ("Metadata", format_metadata),
+}
+DEFAULT_REPO_TABLE_COLUMNS = ("identifier", "description", "tags", "metadata")
+
+
+def iterate_repo_table(
+    repos: typing.Iterable[RepositoryFacade],
+    columns: typing.Sequence[str] = DEFAULT_REPO_TABLE_COLUMNS,
+    *,
+    limit: int | None = None,
+    page_size: int | None = None,
+) -> typing.Generator[str, None, None]:
+    unknown_columns = set(columns) - REPO_TABLE_COLUMNS.keys()
+    if not columns or unknown_columns:
+        raise UnknownTableColumnError(", ".join(sorted(unknown_columns)))
+
+    # GitHub-flavoured Markdown does not need aligned columns, so the rows
+    # are written as soon as they are formatted, without measuring them.
+    header = "| " + " | ".join(REPO_TABLE_COLUMNS[name][0] for name in columns)
+    header += " |\n|" + " --- |" * len(columns)
+    formatters = [REPO_TABLE_COLUMNS[name][1] for name in columns]
+
+    rows_count = 0
+    for repo in itertools.islice(repos, limit):
+        # The tables are separated by an empty line.
+        if page_size and rows_count % page_size == 0:
+            yield ("\n\n" if rows_count else "") + header
+        elif not rows_count:
+            yield header
+
+        yield "\n| " + " | ".join(
+            [formatter(repo) for formatter in formatters],
+        ) + " |"
+
+        rows_count += 1
+
+    if not rows_count:
+        yield header
+
+    get_logger().info(f"{rows_count} repositories were formatted as a table.")
+
+
+def to_repo_table(
+    repos: typing.Iterable[RepositoryFacade],
+    columns: typing.Sequence[str] = DEFAULT_REPO_TABLE_COLUMNS,
+    *,
+    limit: int | None = None,
+    page_size: int | None = None,
+) -> str:
     get_logger().info("A list of repositories will be formatted as a table.")
 
-    data = []
-    for repo in repos:
-        get_logger().info(
-            f'Repository "{repo.name}" will be added to a table.',
-        )
-
-        identifier = (
-            f"[`{repo.owner}/{repo.name}`]"
-            f"(https://github.com/{repo.owner}/{repo.name}) "
-        )
-        if repo.is_fork:
-            identifier += "🪞"
-        if repo.is_archived:
-            identifier += "📦"
-        identifier = tinify(identifier)
-
-        description = tinify(trim_text(repo.description, 50))
-        creation_date = repo.creation_date.strftime("%b%%20%Y")
-        last_push = repo.last_push.strftime("%b%%20%Y")
-
-        tags = " ".join([f"`#{tag}`" for tag in repo.tags])
-        tags = tinify(tags)
-
-        entry = [
-            identifier,
-            description,
-            tags,
-            (
-                f"<img height='12px' alt='Created on: {creation_date}'"
-                " src='https://img.shields.io/badge/"
-                f"Created%20on-{creation_date}-black'/> "
-                f"<img height='12px' alt='Last push on: {last_push}'"
-                " src='https://img.shields.io/badge/"
-                f"Last%20push%20on-{last_push}-green'/> "
-                f"<img height='12px' alt='Stars: {repo.stars_count}'"
-                " src='https://img.shields.io/badge/"
-                f"Stars-{repo.stars_count}-yellow'/> "
-            ),
-        ]
-        data.append(entry)
-
-    return tabulate(
-        data,
-        headers=["Identifier", "Description", "Tags", "Metadata"],
-        tablefmt="github",
+    return "".join(
+        iterate_repo_table(
+            repos,
+            columns,
+            limit=limit,
+            page_size=page_size,
+        ),
     )
 
 
@@ -102,3 +185,7 @@ def to_list(
             for index, org in enumerate(items)
         ],
     )
+
+
+class UnknownTableColumnError(GitPortfolioError):
+    """A column of the repository table is unknown."""
@@ -1,60 +1,230 @@
 from __future__ import annotations
 
+import functools
+import threading
 import typing
-
-from github import Auth, Github
-from github.Repository import Repository
-
-from gitportfolio.cache import Cache
-from gitportfolio.config import Configuration
+from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+
+from gitportfolio.cache import (
+    Cache,
+    get_namespace,
+    get_namespaced_identifier,
+)
+from gitportfolio.config import (
+    NAMESPACE_DIGEST_SEPARATOR,
+    AccountTokenNotSetError,
+    Configuration,
+)
+from gitportfolio.exceptions import GitPortfolioError
 from gitportfolio.facade import OrganisationFacade, RepositoryFacade
+from gitportfolio.graphql import (
+    MAX_LANGUAGES,
+    ORGS_QUERY,
+    REPOS_QUERY,
+    create_org_facade_from_node,
+    create_repo_facade_from_node,
+    get_node_full_name,
+    iterate_pages,
+)
 from gitportfolio.logger import get_logger
+from gitportfolio.scheduler import (
+    DEFAULT_RATE_LIMIT_RESERVE,
+    RequestBudgetExhaustedError,
+    RequestScheduler,
+)
+from gitportfolio.tracing import span
+
+# PyGithub, whose import is slow, is only imported when the data is fetched
+# from GitHub, and not when it is served from the cache.
+if typing.TYPE_CHECKING:
+    from github import Github
+    from github.Repository import Repository
+
+    from gitportfolio.cache import CachedRecords
+    from gitportfolio.config import Account
+
+T = typing.TypeVar("T")
 
 REPOS_CACHE_KEY = "repos"
 ORGS_CACHE_KEY = "orgs"
+REPOS_SYNC_CACHE_KEY = "repos_sync"
+PAGES_SYNC_CACHE_KEY = "repos_sync_pages"
+DEFAULT_FETCH_WORKERS = 8
+DEFAULT_FETCH_BACKEND = "rest"
+PAGE_SIZE = 100
+DEFAULT_FETCH_RETRIES = 10
+DEFAULT_FETCH_BACKOFF = 0.5
 
 orgs: list[OrganisationFacade] = []
 repos: list[RepositoryFacade] = []
+synced_accounts: set[str] = set()
+account_namespaces: dict[Account, str] = {}
+github_clients: dict[Account, Github] = {}
+request_schedulers: dict[Account, RequestScheduler] = {}
+github_client_lock = threading.Lock()
+
+
+def get_fetch_workers() -> int:
+    workers = Configuration().get_setting(
+        "fetching",
+        "workers",
+        DEFAULT_FETCH_WORKERS,
+    )
 
+    return max(1, int(workers))
 
-def get_orgs() -> typing.Generator[OrganisationFacade, None, None]:
-    config = Configuration().get_config()
-    pat = Configuration().get_github_pat()
+
+def is_incremental_sync() -> bool:
+    return bool(
+        Configuration().get_setting("fetching", "incremental", False),
+    )
+
+
+def find_cached_namespace(account: Account) -> str:
+    prefix = account.name + NAMESPACE_DIGEST_SEPARATOR
+    namespaces = {
+        namespace
+        for namespace in map(get_namespace, Cache().get_identifiers())
+        if namespace.startswith(prefix)
+        and NAMESPACE_DIGEST_SEPARATOR not in namespace[len(prefix) :]
+    }
+
+    # The namespace of the cached data is only used when it is unambiguous.
+    if len(namespaces) != 1:
+        raise AccountTokenNotSetError(account.token_variable)
+
+    return namespaces.pop()
+
+
+def get_account_namespace(account: Account) -> str:
+    namespace = account_namespaces.get(account, None)
+    if namespace is None:
+        # Without a token, the account is served from the data cached with
+        # the token it last used.
+        namespace = (
+            account.namespace
+            if account.token
+            else find_cached_namespace(account)
+        )
+        account_namespaces[account] = namespace
+
+    return namespace
+
+
+def get_cache_key(account: Account, key: str) -> str:
+    return get_namespaced_identifier(get_account_namespace(account), key)
+
+
+def create_github_client(account: Account, workers: int = 1) -> Github:
+    from github import Auth, Consts, Github, GithubRetry
+
+    configuration = Configuration()
+    api_url = configuration.get_setting(
+        "fetching",
+        "api_url",
+        Consts.DEFAULT_BASE_URL,
+    )
+    pool_size = configuration.get_setting("fetching", "pool_size", workers)
+    retries = configuration.get_setting(
+        "fetching",
+        "retries",
+        DEFAULT_FETCH_RETRIES,
+    )
+    backoff = configuration.get_setting(
+        "fetching",
+        "backoff",
+        DEFAULT_FETCH_BACKOFF,
+    )
 
     auth = Auth.Token(
-        pat,
+        account.get_token(),
     )
-    github_client = Github(auth=auth)
 
-    orgs = Cache().get_cached_object(ORGS_CACHE_KEY)
-    if orgs:
-        yield from orgs
-    else:
-        username = github_client.get_user().login
+    # With concurrent requests, the pacing is left to the retry mechanism of
+    # PyGithub, which waits when the (secondary) rate limits are hit.
+    return Github(
+        auth=auth,
+        base_url=api_url,
+        pool_size=max(int(pool_size), 1),
+        retry=GithubRetry(total=int(retries), backoff_factor=float(backoff)),
+        seconds_between_requests=(
+            Consts.DEFAULT_SECONDS_BETWEEN_REQUESTS if workers <= 1 else None
+        ),
+    )
 
-        orgs = []
-        for org in github_client.get_user(username).get_orgs():
-            org_facade = OrganisationFacade(org.name or "", org.login)
 
-            org_config = config["orgs"].get(org.login, {})
-            org_facade.excluded = org_config.get("excluded", False)
+def create_request_scheduler(client: Github) -> RequestScheduler:
+    reserve = Configuration().get_setting(
+        "fetching",
+        "rate_limit_reserve",
+        DEFAULT_RATE_LIMIT_RESERVE,
+    )
 
-            orgs.append(org_facade)
+    # PyGithub keeps the rate limit from the headers of the last response.
+    def get_rate_limit() -> tuple[int, float]:
+        remaining, _ = client.requester.rate_limiting
 
-            get_logger().info(
-                f"The organisation {org_facade.name} was fetched from GitHub.",
+        return remaining, client.requester.rate_limiting_resettime
+
+    return RequestScheduler(get_rate_limit, int(reserve))
+
+
+def get_github_client(account: Account) -> Github:
+    # A single client per account, and thus a single pool of connections and
+    # a single rate limit, is used for all the requests of a run.
+    with github_client_lock:
+        github_client = github_clients.get(account, None)
+        if github_client is None:
+            github_client = create_github_client(account, get_fetch_workers())
+
+            github_clients[account] = github_client
+            request_schedulers[account] = create_request_scheduler(
+                github_client,
             )
 
-            yield org_facade
+        return github_client
+
+
+def get_request_scheduler(account: Account) -> RequestScheduler:
+    get_github_client(account)
+
+    return request_schedulers[account]
+
+
+def close_github_client() -> None:
+    with github_client_lock:
+        for github_client in github_clients.values():
+            github_client.close()
+
+        if github_clients:
+            get_logger().info("The connections to GitHub were closed.")
+
+        for request_scheduler in request_schedulers.values():
+            request_scheduler.report()
+
+        github_clients.clear()
+        request_schedulers.clear()
+
 
-        Cache().cache_object(ORGS_CACHE_KEY, orgs)
+def get_language_names(languages: dict[str, typing.Any]) -> list[str]:
+    # PyGithub adds the URL of the request to the returned objects, next to
+    # the sizes of the languages.
+    return [name for name, size in languages.items() if isinstance(size, int)]
 
-    github_client.close()
 
+def get_repo_languages(repo: Repository) -> list[str]:
+    return get_language_names(repo.get_languages())
 
-def create_repo_facade(repo: Repository) -> RepositoryFacade:
-    config = Configuration().get_config()
-    repo_config = config["repos"].get(repo.name, {})
+
+def create_repo_facade(
+    repo: Repository,
+    languages: list[str] | None = None,
+) -> RepositoryFacade:
+    repo_config = Configuration().get_repo_settings(repo.name)
+
+    if languages is None:
+        languages = get_repo_languages(repo)
 
     return RepositoryFacade(
         repo.name,
@@ -62,93 +232,680 @@ def create_repo_facade(repo: Repository) -> RepositoryFacade:
         repo.owner.login,
         repo.created_at,
         repo.pushed_at,
-        list(repo.get_languages().keys()),
-        repo_config.get("tags", []),
+        languages,
+        repo_config["tags"],
         repo.stargazers_count,
         repo.private,
         repo.fork,
         repo.archived,
-        repo_config.get("shown", True),
+        repo_config["shown"],
     )
 
 
-def is_repo_skipped(
-    orgs: list[OrganisationFacade],
-    repo: Repository | RepositoryFacade,
-) -> bool:
-    config = Configuration().get_config()
+def is_repo_skipped(repo: Repository | RepositoryFacade) -> bool:
+    configuration = Configuration()
 
-    owner = repo.owner.login if type(repo) == Repository else repo.owner
+    owner = (
+        repo.owner if isinstance(repo, RepositoryFacade) else repo.owner.login
+    )
     get_logger().info(
-        f'Checking if the repository "{owner}/{repo.name}" should be skipped.',
+        'Checking if the repository "%s/%s" should be skipped.',
+        owner,
+        repo.name,
     )
 
-    repo_config = config["repos"].get(repo.name, {}).get("shown", True)
-    if not repo_config:
+    if not configuration.get_repo_settings(repo.name)["shown"]:
         return True
 
-    return any(org.login == owner and org.excluded for org in orgs)
+    return configuration.is_org_excluded(owner)
 
 
 def update_meta_from_config(
     repo: RepositoryFacade,
 ) -> RepositoryFacade:
-    config = Configuration().get_config()
-    repo_config = config["repos"].get(repo.name, {})
+    repo_config = Configuration().get_repo_settings(repo.name)
 
-    repo.is_shown = repo_config.get("shown", True)
-    repo.tags = repo_config.get("tags", [])
+    repo.is_shown = repo_config["shown"]
+    repo.tags = list(repo_config["tags"])
 
     return repo
 
 
-def get_repos(
-    orgs: list[OrganisationFacade],
-) -> typing.Generator[RepositoryFacade, None, None]:
-    Configuration().get_config()
-    pat = Configuration().get_github_pat()
+def is_state_changed(
+    previous_state: CachedRecords | dict,
+    state: dict[str, dict],
+) -> bool:
+    if len(previous_state) != len(state):
+        return True
 
-    auth = Auth.Token(
-        pat,
+    return any(
+        previous_state.get(key) != value for key, value in state.items()
     )
-    github_client = Github(auth=auth)
 
-    repos = Cache().get_cached_object(REPOS_CACHE_KEY)
-    if repos:
-        for repo in repos:
-            repo = update_meta_from_config(repo)
 
-            if is_repo_skipped(orgs, repo):
+class FetchBackend:
+    account: Account
+    github_client: Github
+    scheduler: RequestScheduler
+    workers: int
+
+    def __init__(self, account: Account, workers: int = 1) -> None:
+        self.account = account
+        self.workers = workers
+        self.github_client = get_github_client(account)
+        self.scheduler = get_request_scheduler(account)
+
+    @abstractmethod
+    def fetch_orgs(self) -> typing.Iterable[OrganisationFacade]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def fetch_repos(self) -> typing.Iterable[RepositoryFacade]:
+        raise NotImplementedError
+
+
+class RestFetchBackend(FetchBackend):
+    def get_json(
+        self,
+        url: str,
+        headers: dict | None = None,
+        *,
+        essential: bool = True,
+    ) -> tuple[dict, typing.Any]:
+        return self.scheduler.run(
+            lambda: self.github_client.requester.requestJsonAndCheck(
+                "GET",
+                url,
+                headers=headers,
+            ),
+            essential=essential,
+        )
+
+    def fetch_orgs(self) -> typing.Iterable[OrganisationFacade]:
+        _, user = self.get_json("/user")
+        raw_orgs = self.get_pages(f"/users/{user['login']}/orgs")
+
+        for raw_org in raw_orgs:
+            # The listed organisations may lack their names.
+            org = raw_org
+            if "name" not in org:
+                _, org = self.get_json(f"/orgs/{org['login']}")
+
+            yield OrganisationFacade(org["name"] or "", org["login"])
+
+    def get_workers_within_rate_limit(self, requests_count: int) -> int:
+        # Avoid starting more requests than the remaining rate limit allows
+        remaining = self.scheduler.remaining
+        if remaining is not None and remaining < requests_count:
+            get_logger().warning(
+                f"Only {remaining} requests are left until the rate limit is"
+                " reset. The languages will be fetched sequentially.",
+            )
+
+            return 1
+
+        return self.workers
+
+    def get_cached_languages(self, full_name: str) -> list[str]:
+        repos = Cache().get_cached_records(
+            get_cache_key(self.account, REPOS_CACHE_KEY),
+        )
+        cached_repo = repos.get(full_name) if repos else None
+
+        return list(cached_repo.languages) if cached_repo else []
+
+    def fetch_languages(self, repo: Repository) -> list[str]:
+        # The languages are optional, so the cached ones are used when the
+        # rate limit left is reserved to the essential requests.
+        try:
+            with span("github.languages"):
+                return self.scheduler.run(
+                    lambda: get_repo_languages(repo),
+                    essential=False,
+                )
+        except RequestBudgetExhaustedError:
+            return self.get_cached_languages(repo.full_name)
+
+    def create_repos(
+        self,
+        raw_repos: list[dict],
+    ) -> typing.Generator[tuple[Repository, dict], None, None]:
+        from github.Repository import Repository
+
+        for raw_repo in raw_repos:
+            repo = self.github_client.create_from_raw_data(
+                Repository,
+                raw_repo,
+            )
+
+            if is_repo_skipped(repo):
                 get_logger().info(
-                    f'The repository "{repo.name}" was skipped.',
+                    'The repository "%s" was skipped.',
+                    repo.name,
                 )
 
                 continue
 
-            yield repo
+            yield repo, raw_repo
+
+    def fetch_repo(self, full_name: str) -> RepositoryFacade | None:
+        from github.Repository import Repository
+
+        _, raw_repo = self.get_json(f"/repos/{full_name}")
+        repo = self.github_client.create_from_raw_data(Repository, raw_repo)
+
+        if is_repo_skipped(repo):
+            return None
+
+        return create_repo_facade(repo, self.fetch_languages(repo))
+
+    def fetch_repos(self) -> typing.Iterable[RepositoryFacade]:
+        if is_incremental_sync():
+            yield from self.sync_repos()
+
+            return
+
+        raw_repos = self.get_pages("/user/repos")
+        fetched_repos = [repo for repo, _ in self.create_repos(raw_repos)]
+
+        workers = self.get_workers_within_rate_limit(len(fetched_repos))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # The results are yielded in the order of the repositories.
+            languages = executor.map(self.fetch_languages, fetched_repos)
+
+            for repo, repo_languages in zip(fetched_repos, languages):
+                yield create_repo_facade(repo, repo_languages)
+
+    def get_conditionally(
+        self,
+        url: str,
+        state: dict | None,
+        *,
+        essential: bool = True,
+    ) -> tuple[dict, typing.Any]:
+        headers = {}
+        if state and state.get("etag"):
+            headers["If-None-Match"] = state["etag"]
+        if state and state.get("last_modified"):
+            headers["If-Modified-Since"] = state["last_modified"]
+
+        response_headers, data = self.get_json(
+            url,
+            headers,
+            essential=essential,
+        )
+
+        # An empty body is only returned for "304 Not Modified" responses,
+        # which do not count against the rate limit.
+        if state and data is None:
+            self.scheduler.refund()
+
+            return state, None
+
+        return {
+            "etag": response_headers.get("etag", None),
+            "last_modified": response_headers.get("last-modified", None),
+            "has_next": 'rel="next"' in response_headers.get("link", ""),
+        }, data
+
+    def get_pages(self, url: str) -> list:
+        items = []
+        page = 1
+        while True:
+            page_state, data = self.get_conditionally(
+                f"{url}?per_page={PAGE_SIZE}&page={page}",
+                None,
+            )
 
-    else:
-        repos = []
-        for repo in github_client.get_user().get_repos():
-            if is_repo_skipped(orgs, repo):
+            items.extend(data)
+
+            if not page_state["has_next"]:
+                break
+
+            page += 1
+
+        return items
+
+    def sync_pages(
+        self,
+        url: str,
+        previous_pages: CachedRecords | dict,
+        previous_repos: CachedRecords | dict,
+    ) -> tuple[dict[str, dict], list[tuple[str, dict | None]]]:
+        pages = {}
+        listed_repos: list[tuple[str, dict | None]] = []
+        page = 1
+        while True:
+            page_url = f"{url}?per_page={PAGE_SIZE}&page={page}"
+
+            # A page which was not modified is listed again from the states
+            # of its repositories, so that it is fetched when one is missing.
+            page_state = previous_pages.get(page_url)
+            if page_state and any(
+                previous_repos.get(full_name) is None
+                for full_name in page_state["repos"]
+            ):
+                page_state = None
+
+            page_state, raw_repos = self.get_conditionally(
+                page_url,
+                page_state,
+            )
+
+            if raw_repos is None:
+                listed_repos.extend(
+                    (full_name, None) for full_name in page_state["repos"]
+                )
+            else:
+                page_state = {
+                    **page_state,
+                    "repos": [raw_repo["full_name"] for raw_repo in raw_repos],
+                }
+                listed_repos.extend(
+                    (raw_repo["full_name"], raw_repo) for raw_repo in raw_repos
+                )
+
+            pages[page_url] = page_state
+
+            if not page_state["has_next"]:
+                break
+
+            page += 1
+
+        return pages, listed_repos
+
+    def sync_languages(
+        self,
+        repo_facade: RepositoryFacade,
+        repo_state: dict | None,
+    ) -> dict:
+        try:
+            languages_state, languages = self.get_conditionally(
+                f"/repos/{repo_facade.full_name}/languages",
+                repo_state["languages"] if repo_state else None,
+                essential=False,
+            )
+        except RequestBudgetExhaustedError:
+            # The repository keeps its previous state, so that its languages
+            # are fetched by the next synchronisation.
+            if repo_state is None:
+                repo_facade.languages = self.get_cached_languages(
+                    repo_facade.full_name,
+                )
+
+                repo_state = {"pushed_at": None, "languages": None}
+
+            return {**repo_state, "repo": repo_facade}
+
+        if languages is not None:
+            repo_facade.languages = get_language_names(languages)
+
+        return {
+            "pushed_at": repo_facade.last_push,
+            "languages": languages_state,
+            "repo": repo_facade,
+        }
+
+    def sync_repos(self) -> typing.Iterable[RepositoryFacade]:
+        from github.Repository import Repository
+
+        # Only the validators of the pages, and the facades of the
+        # repositories with the validators of their languages, are kept.
+        pages_key = get_cache_key(self.account, PAGES_SYNC_CACHE_KEY)
+        repos_key = get_cache_key(self.account, REPOS_SYNC_CACHE_KEY)
+        previous_pages: CachedRecords | dict[str, dict] = (
+            Cache().get_cached_records(pages_key) or {}
+        )
+        previous_repos: CachedRecords | dict[str, dict] = (
+            Cache().get_cached_records(repos_key) or {}
+        )
+
+        pages, listed_repos = self.sync_pages(
+            "/user/repos",
+            previous_pages,
+            previous_repos,
+        )
+
+        repo_states: dict[str, dict] = {}
+        shown_repos = []
+        changed_repos = []
+        for full_name, raw_repo in listed_repos:
+            repo_state = previous_repos.get(full_name)
+            if raw_repo is None and repo_state is not None:
+                repo_facade = update_meta_from_config(repo_state["repo"])
+            else:
+                # A repository listed by a page which was not modified, but
+                # without a state, is fetched on its own.
+                if raw_repo is None:
+                    _, raw_repo = self.get_json(f"/repos/{full_name}")
+
+                repo_facade = create_repo_facade(
+                    self.github_client.create_from_raw_data(
+                        Repository,
+                        raw_repo,
+                    ),
+                    list(repo_state["repo"].languages) if repo_state else [],
+                )
+
+            repo_states[full_name] = {
+                "pushed_at": repo_state["pushed_at"] if repo_state else None,
+                "languages": repo_state["languages"] if repo_state else None,
+                "repo": repo_facade,
+            }
+
+            if is_repo_skipped(repo_facade):
                 get_logger().info(
-                    f'The repository "{repo.name}" was skipped.',
+                    'The repository "%s" was skipped.',
+                    repo_facade.name,
                 )
 
                 continue
 
-            repo_facade = create_repo_facade(repo)
+            shown_repos.append(full_name)
+
+            # The languages of the unchanged repositories are kept.
+            if repo_state is None or (
+                repo_state["pushed_at"] != repo_facade.last_push
+            ):
+                changed_repos.append(full_name)
+
+        get_logger().info(
+            f"{len(changed_repos)} out of {len(shown_repos)} repositories"
+            " changed since the last synchronisation.",
+        )
+
+        workers = self.get_workers_within_rate_limit(len(changed_repos))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            synced_states = executor.map(
+                lambda full_name: self.sync_languages(
+                    repo_states[full_name]["repo"],
+                    previous_repos.get(full_name),
+                ),
+                changed_repos,
+            )
+
+            for full_name, repo_state in zip(
+                changed_repos,
+                synced_states,
+                strict=True,
+            ):
+                repo_states[full_name] = repo_state
+
+        for full_name in shown_repos:
+            yield repo_states[full_name]["repo"]
+
+        # Nothing is written when every page and repository is unchanged.
+        if is_state_changed(previous_pages, pages) or is_state_changed(
+            previous_repos,
+            repo_states,
+        ):
+            Cache().cache_records(pages_key, pages)
+            Cache().cache_records(repos_key, repo_states)
+
+
+class GraphQLFetchBackend(FetchBackend):
+    def _query(self, query: str, variables: dict) -> dict:
+        _, data = self.scheduler.run(
+            lambda: self.github_client.requester.graphql_query(
+                query,
+                variables,
+            ),
+        )
+
+        return data
+
+    def fetch_orgs(self) -> typing.Iterable[OrganisationFacade]:
+        for node in iterate_pages(self._query, ORGS_QUERY, "organizations"):
+            yield create_org_facade_from_node(node)
+
+    def fetch_repos(self) -> typing.Iterable[RepositoryFacade]:
+        nodes = iterate_pages(
+            self._query,
+            REPOS_QUERY,
+            "repositories",
+            {"languages": MAX_LANGUAGES},
+        )
+
+        # The repositories are listed in the order of their full names, as
+        # by the REST API, instead of their names alone.
+        for node in sorted(nodes, key=get_node_full_name):
+            repo_facade = create_repo_facade_from_node(node)
+
+            if is_repo_skipped(repo_facade):
+                get_logger().info(
+                    'The repository "%s" was skipped.',
+                    repo_facade.name,
+                )
+
+                continue
+
+            yield repo_facade
+
+
+FETCH_BACKENDS: dict[str, type[FetchBackend]] = {
+    "rest": RestFetchBackend,
+    "graphql": GraphQLFetchBackend,
+}
+
+
+def create_fetch_backend(account: Account) -> FetchBackend:
+    name = Configuration().get_setting(
+        "fetching",
+        "backend",
+        DEFAULT_FETCH_BACKEND,
+    )
+
+    backend_class = FETCH_BACKENDS.get(name, None)
+    if backend_class is None:
+        raise UnknownFetchBackendError
+
+    get_logger().info(
+        f'The fetch backend "{name}" will be used for the account'
+        f' "{account.name}".',
+    )
+
+    return backend_class(account, get_fetch_workers())
+
+
+def map_accounts(
+    function: typing.Callable[[Account], typing.Iterable[T]],
+) -> list[typing.Iterable[T]]:
+    accounts = Configuration().get_accounts()
+    if len(accounts) == 1:
+        return [function(accounts[0])]
+
+    # Each account has its own rate limit, so they are fetched in parallel.
+    with ThreadPoolExecutor(max_workers=len(accounts)) as executor:
+        return list(
+            executor.map(lambda account: list(function(account)), accounts),
+        )
+
+
+def fetch_orgs_from_github(account: Account) -> list[OrganisationFacade]:
+    backend = create_fetch_backend(account)
+
+    orgs = []
+    with span("github.orgs"):
+        for org_facade in backend.fetch_orgs():
+            org_facade.excluded = Configuration().is_org_excluded(
+                org_facade.login,
+            )
+
+            orgs.append(org_facade)
+
+            get_logger().info(
+                "The organisation %s was fetched from GitHub.",
+                org_facade.name,
+            )
+
+    return orgs
+
+
+def refresh_orgs(account: Account) -> list[OrganisationFacade]:
+    orgs = fetch_orgs_from_github(account)
+    Cache().cache_object(get_cache_key(account, ORGS_CACHE_KEY), orgs)
+
+    return orgs
+
+
+def get_account_orgs(
+    account: Account,
+) -> typing.Generator[OrganisationFacade, None, None]:
+    cache_key = get_cache_key(account, ORGS_CACHE_KEY)
+
+    orgs = Cache().get_cached_object(cache_key)
+    if orgs:
+        if Cache().is_expired(cache_key):
+            Cache().revalidate(
+                cache_key,
+                functools.partial(refresh_orgs, account),
+            )
+
+        yield from orgs
+    else:
+        yield from refresh_orgs(account)
+
+
+def get_orgs() -> typing.Generator[OrganisationFacade, None, None]:
+    logins = set()
+    for account_orgs in map_accounts(get_account_orgs):
+        for org in account_orgs:
+            # The accounts of a team usually share organisations.
+            if org.login in logins:
+                continue
+
+            logins.add(org.login)
+
+            yield org
+
+
+def fetch_repos_from_github(account: Account) -> list[RepositoryFacade]:
+    backend = create_fetch_backend(account)
+
+    repos = []
+    with span("github.repos"):
+        for repo_facade in backend.fetch_repos():
             repo_facade = update_meta_from_config(repo_facade)
 
             get_logger().info(
-                f'The repository "{repo_facade.name}" was fetched from'
-                " GitHub.",
+                'The repository "%s" was fetched from GitHub.',
+                repo_facade.name,
             )
 
             if repo_facade.is_shown:
                 repos.append(repo_facade)
-                yield repo_facade
 
-        Cache().cache_object(REPOS_CACHE_KEY, repos)
+    synced_accounts.add(get_account_namespace(account))
+
+    return repos
+
+
+def refresh_repos(account: Account) -> list[RepositoryFacade]:
+    repos = fetch_repos_from_github(account)
+
+    # Only the changed repositories are written into the cache.
+    Cache().cache_records(
+        get_cache_key(account, REPOS_CACHE_KEY),
+        {repo.full_name: repo for repo in repos},
+    )
+
+    return repos
+
+
+def get_repo_account(full_name: str) -> Account:
+    accounts = Configuration().get_accounts()
+
+    # A repository is refreshed with the account that fetched it, if any.
+    for account in accounts:
+        repos = Cache().get_cached_records(
+            get_cache_key(account, REPOS_CACHE_KEY),
+        )
+        if repos and repos.get(full_name) is not None:
+            return account
+
+    return accounts[0]
+
+
+def refresh_repo(full_name: str) -> RepositoryFacade | None:
+    account = get_repo_account(full_name)
+
+    # A single repository is always fetched with the REST API.
+    repo_facade = RestFetchBackend(account).fetch_repo(full_name)
+    if repo_facade is None or not repo_facade.is_shown:
+        get_logger().info(f'The repository "{full_name}" is not shown.')
+
+        return None
+
+    Cache().cache_records(
+        get_cache_key(account, REPOS_CACHE_KEY),
+        {repo_facade.full_name: repo_facade},
+        partial=True,
+    )
+
+    get_logger().info(f'The repository "{full_name}" was refreshed.')
+
+    return repo_facade
+
+
+def get_account_repos(
+    account: Account,
+) -> typing.Generator[RepositoryFacade, None, None]:
+    cache_key = get_cache_key(account, REPOS_CACHE_KEY)
+    repos = Cache().get_cached_records(cache_key)
+
+    # In the incremental mode, the cached repositories are synchronised once
+    # per run, unless the account has no token to fetch them with.
+    synced = not (
+        is_incremental_sync()
+        and get_account_namespace(account) not in synced_accounts
+    )
+    if repos and not synced and not account.token:
+        get_logger().warning(
+            f'The token of the account "{account.name}" is not set. Its'
+            " cached repositories will not be synchronised.",
+        )
+
+        # The warning is only logged once per run.
+        synced_accounts.add(get_account_namespace(account))
+        synced = True
+
+    if repos and synced:
+        if Cache().is_expired(cache_key):
+            Cache().revalidate(
+                cache_key,
+                functools.partial(refresh_repos, account),
+            )
+
+        for repo in repos:
+            repo = update_meta_from_config(repo)
+
+            if is_repo_skipped(repo):
+                get_logger().info(
+                    'The repository "%s" was skipped.',
+                    repo.name,
+                )
+
+                continue
+
+            yield repo
+
+    else:
+        yield from refresh_repos(account)
+
+
+def get_repos() -> typing.Generator[RepositoryFacade, None, None]:
+    full_names = set()
+    for account_repos in map_accounts(get_account_repos):
+        for repo in account_repos:
+            # The repositories of the organisations shared by several
+            # accounts are only kept once.
+            if repo.full_name in full_names:
+                continue
+
+            full_names.add(repo.full_name)
+
+            yield repo
+
 
-    github_client.close()
+class UnknownFetchBackendError(GitPortfolioError):
+    """The fetch backend is unknown."""
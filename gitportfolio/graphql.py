@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import typing
+from datetime import datetime
+
+from gitportfolio.facade import OrganisationFacade, RepositoryFacade
+
+PAGE_SIZE = 100
+MAX_LANGUAGES = 100
+
+# Unlike the REST API, which lists the public memberships of the user, the
+# viewer's organisations also include its private memberships.
+ORGS_QUERY = """
+query ($first: Int!, $cursor: String) {
+  viewer {
+    organizations(first: $first, after: $cursor) {
+      pageInfo {
+        hasNextPage
+        endCursor
+      }
+      nodes {
+        login
+        name
+      }
+    }
+  }
+}
+"""
+
+REPOS_QUERY = """
+query ($first: Int!, $cursor: String, $languages: Int!) {
+  viewer {
+    repositories(
+      first: $first
+      after: $cursor
+      ownerAffiliations: [OWNER, COLLABORATOR, ORGANIZATION_MEMBER]
+      orderBy: {field: NAME, direction: ASC}
+    ) {
+      pageInfo {
+        hasNextPage
+        endCursor
+      }
+      nodes {
+        name
+        description
+        owner {
+          login
+        }
+        createdAt
+        pushedAt
+        stargazerCount
+        isPrivate
+        isFork
+        isArchived
+        languages(
+          first: $languages
+          orderBy: {field: SIZE, direction: DESC}
+        ) {
+          nodes {
+            name
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+
+def parse_datetime(value: str | None) -> datetime | None:
+    if not value:
+        return None
+
+    return datetime.fromisoformat(value)
+
+
+def get_page(
+    data: dict,
+    connection: str,
+) -> tuple[list[dict], str | None]:
+    page = data["data"]["viewer"][connection]
+    page_info = page["pageInfo"]
+
+    cursor = page_info["endCursor"] if page_info["hasNextPage"] else None
+
+    return page["nodes"], cursor
+
+
+def iterate_pages(
+    query_function: typing.Callable[[str, dict], dict],
+    query: str,
+    connection: str,
+    variables: dict | None = None,
+) -> typing.Generator[dict, None, None]:
+    cursor = None
+    while True:
+        data = query_function(
+            query,
+            {
+                **(variables or {}),
+                "first": PAGE_SIZE,
+                "cursor": cursor,
+            },
+        )
+
+        nodes, cursor = get_page(data, connection)
+        yield from nodes
+
+        if cursor is None:
+            break
+
+
+def get_node_full_name(node: dict) -> str:
+    return f"{node['owner']['login']}/{node['name']}"
+
+
+def create_org_facade_from_node(node: dict) -> OrganisationFacade:
+    return OrganisationFacade(node["name"] or "", node["login"])
+
+
+def create_repo_facade_from_node(node: dict) -> RepositoryFacade:
+    return RepositoryFacade(
+        node["name"],
+        node["description"],
+        node["owner"]["login"],
+        parse_datetime(node["createdAt"]),  # type: ignore[arg-type]
+        parse_datetime(node["pushedAt"]),  # type: ignore[arg-type]
+        [language["name"] for language in node["languages"]["nodes"]],
+        [],
+        node["stargazerCount"],
+        node["isPrivate"],
+        node["isFork"],
+        node["isArchived"],
+        True,
+    )
@@ -1,30 +1,59 @@
 import logging
 import sys
-
-from github import set_log_level as pygithub_set_log_level
-from rich.logging import RichHandler
+import threading
 
 FORMAT = "%(message)s"
-logging.basicConfig(
-    level=logging.INFO,
-    format=FORMAT,
-    datefmt="[%X]",
-    handlers=[RichHandler()],
-)
+LOGGER_NAME = "gitportfolio"
+
+configuration_lock = threading.Lock()
+is_configured = False
+
+# Retrieved once, as getLogger acquires the lock of the logging module.
+logger = logging.getLogger(LOGGER_NAME)
+
+
+def configure_logger() -> None:
+    global is_configured  # noqa: PLW0603
+
+    with configuration_lock:
+        if is_configured:
+            return
+
+        is_configured = True
+
+        # The handler, whose import is slow, is not needed when the logs are
+        # discarded.
+        if not logger.isEnabledFor(logging.CRITICAL):
+            return
+
+        from rich.logging import RichHandler
+
+        logging.basicConfig(
+            level=logging.INFO,
+            format=FORMAT,
+            datefmt="[%X]",
+            handlers=[RichHandler()],
+        )
 
 
 def get_logger() -> logging.Logger:
-    return logging.getLogger("gitportfolio")
+    if not is_configured:
+        configure_logger()
+
+    return logger
 
 
 def disable_logger() -> None:
+    logging.disable(sys.maxsize)
+
     get_logger().propagate = False
 
-    logging.disable(sys.maxsize)
     logging.getLogger("requests").setLevel(sys.maxsize)
     logging.getLogger("requests").propagate = False
     logging.getLogger("urllib3").setLevel(sys.maxsize)
     logging.getLogger("urllib3").propagate = False
     logging.getLogger("requests.packages.urllib3").setLevel(sys.maxsize)
     logging.getLogger("requests.packages.urllib3").propagate = False
-    pygithub_set_log_level(sys.maxsize)
+
+    # Same as PyGithub's set_log_level, without importing it
+    logging.getLogger("github").setLevel(sys.maxsize)
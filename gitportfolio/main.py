@@ -1,86 +1,322 @@
 from __future__ import annotations
 
-from pathlib import Path
+import contextlib
+import typing
 
 import click
 
+from gitportfolio.batch import DEFAULT_JOBS, read_manifest, render_files
 from gitportfolio.cache import Cache
 from gitportfolio.config import Configuration
-from gitportfolio.dsl import parse
+from gitportfolio.github import close_github_client
 from gitportfolio.logger import disable_logger
+from gitportfolio.renderer import render_file
+from gitportfolio.tracing import enable_tracing, write_report
+from gitportfolio.watch import DEFAULT_WATCH_INTERVAL, Watcher
+
+
+def parse_cache_ttls(
+    _context: click.Context,
+    _parameter: click.Parameter,
+    values: tuple[str, ...],
+) -> list[tuple[str, float]]:
+    ttls = []
+    for value in values:
+        identifier, _, ttl = value.rpartition("=")
+
+        try:
+            ttls.append((identifier, float(ttl)))
+        except ValueError as e:
+            message = f'"{value}" is not formatted as [<key>=]<seconds>.'
+            raise click.BadParameter(message) from e
+
+    return ttls
+
+
+def create_cache(
+    configuration: Configuration,
+    cache_folder: str,
+    cache_ttls: list[tuple[str, float]],
+    *,
+    disabled: bool,
+) -> Cache:
+    default_ttl = configuration.get_setting("caching", "ttl", None)
+    ttls = dict(configuration.get_setting("caching", "ttls", {}))
+
+    for identifier, ttl in cache_ttls:
+        if identifier:
+            ttls[identifier] = ttl
+        else:
+            default_ttl = ttl
+
+    return typing.cast(
+        Cache,
+        Cache(
+            cache_folder,
+            disabled=disabled,
+            default_ttl=default_ttl,
+            ttls=ttls,
+        ),
+    )
+
+
+COMMON_OPTIONS = [
+    click.option(
+        "--config",
+        type=click.Path(exists=True, dir_okay=False, file_okay=True),
+        required=True,
+        help="YAML configuration file",
+    ),
+    click.option(
+        "--cache",
+        type=click.Path(exists=True, dir_okay=True, file_okay=False),
+        required=True,
+        help="Cache folder (only if caching is used)",
+    ),
+    click.option(
+        "--datasources",
+        type=click.Path(exists=True, dir_okay=True, file_okay=False),
+        required=True,
+        help="Folder with custom implementation of data sources",
+    ),
+    click.option(
+        "--caching/--no-caching",
+        default=False,
+        help="Boolean indicating if caching is enabled",
+    ),
+    click.option(
+        "--cache-ttl",
+        "cache_ttls",
+        multiple=True,
+        callback=parse_cache_ttls,
+        help=(
+            "Seconds after which the cached objects are refreshed, optionally"
+            " prefixed by the key of the object (for example, repos=3600)"
+        ),
+    ),
+    click.option(
+        "--invalidate",
+        multiple=True,
+        help="Key of a cached object that is discarded (for example, repos)",
+    ),
+    click.option(
+        "--workers",
+        type=click.IntRange(min=1),
+        default=None,
+        help="Number of concurrent requests used to fetch data from GitHub",
+    ),
+    click.option(
+        "--backend",
+        type=click.Choice(["rest", "graphql"]),
+        default=None,
+        help="API used to fetch data from GitHub",
+    ),
+    click.option(
+        "--incremental/--no-incremental",
+        default=None,
+        help=(
+            "Boolean indicating if the cached repositories are refreshed with"
+            " conditional requests"
+        ),
+    ),
+    click.option(
+        "--render-workers",
+        type=click.IntRange(min=1),
+        default=None,
+        help="Number of placeholders evaluated concurrently",
+    ),
+    click.option(
+        "--verbose/--silent",
+        default=False,
+        help="Boolean indicating if information will be logged",
+    ),
+    click.option(
+        "--update/--no-update",
+        default=False,
+        help="Boolean indicating if the configuration should be updated",
+    ),
+    click.option(
+        "--profile",
+        type=click.Path(dir_okay=False, file_okay=True),
+        default=None,
+        help=(
+            "JSON file into which the durations of the run's phases and its"
+            " counters are written"
+        ),
+    ),
+]
+
+
+def add_common_options(
+    command: typing.Callable[..., None],
+) -> typing.Callable[..., None]:
+    for option in reversed(COMMON_OPTIONS):
+        command = option(command)
+
+    return command
+
+
+@contextlib.contextmanager
+def start_session(
+    config: str,
+    cache: str,
+    cache_ttls: list[tuple[str, float]],
+    invalidate: tuple[str, ...],
+    workers: int | None,
+    backend: str | None,
+    render_workers: int | None,
+    profile: str | None,
+    *,
+    caching: bool,
+    incremental: bool | None,
+    verbose: bool,
+    update: bool,
+) -> typing.Generator[None, None, None]:
+    if not verbose:
+        disable_logger()
+
+    if profile:
+        enable_tracing()
+
+    configuration = Configuration(config)
+    configuration.override_setting("fetching", "workers", workers)
+    configuration.override_setting("fetching", "backend", backend)
+    configuration.override_setting("fetching", "incremental", incremental)
+    configuration.override_setting("rendering", "workers", render_workers)
+    cache_manager = create_cache(
+        configuration,
+        cache,
+        cache_ttls,
+        disabled=(not caching),
+    )
+    for identifier in invalidate:
+        cache_manager.invalidate(identifier)
+
+    # The session is closed, and its report written, even when a render
+    # fails.
+    try:
+        yield
+
+        configuration.update_config(save=update)
+    finally:
+        cache_manager.wait_for_revalidations()
+        cache_manager.close()
+
+        close_github_client()
+
+        if profile:
+            write_report(profile)
 
 
 @click.command()
+@add_common_options
 @click.option(
-    "--config",
+    "--template",
     type=click.Path(exists=True, dir_okay=False, file_okay=True),
     required=True,
-    help="YAML configuration file",
+    help="Template file",
 )
 @click.option(
-    "--cache",
-    type=click.Path(exists=True, dir_okay=True, file_okay=False),
+    "--output",
+    type=click.Path(exists=False),
     required=True,
-    help="Cache folder (only if caching is used)",
+    help="Output file",
 )
+def main(
+    template: str,
+    output: str,
+    datasources: str,
+    **options: typing.Any,
+) -> None:
+    with start_session(**options):
+        render_file(datasources, template, output)
+
+
+@click.command()
+@add_common_options
 @click.option(
-    "--datasources",
-    type=click.Path(exists=True, dir_okay=True, file_okay=False),
+    "--manifest",
+    type=click.Path(exists=True, dir_okay=False, file_okay=True),
     required=True,
-    help="Folder with custom implementation of data sources",
+    help="YAML file with the templates and their outputs",
+)
+@click.option(
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=DEFAULT_JOBS,
+    show_default=True,
+    help="Number of templates rendered in parallel",
 )
+def batch(
+    manifest: str,
+    jobs: int,
+    datasources: str,
+    **options: typing.Any,
+) -> None:
+    with start_session(**options):
+        render_files(datasources, read_manifest(manifest), jobs)
+
+
+@click.command()
+@add_common_options
 @click.option(
     "--template",
     type=click.Path(exists=True, dir_okay=False, file_okay=True),
-    required=True,
+    default=None,
     help="Template file",
 )
 @click.option(
     "--output",
     type=click.Path(exists=False),
-    required=True,
+    default=None,
     help="Output file",
 )
 @click.option(
-    "--caching/--no-caching",
-    default=False,
-    help="Boolean indicating if caching is enabled",
+    "--manifest",
+    type=click.Path(exists=True, dir_okay=False, file_okay=True),
+    default=None,
+    help="YAML file with the templates and their outputs",
 )
 @click.option(
-    "--verbose/--silent",
-    default=False,
-    help="Boolean indicating if information will be logged",
+    "--interval",
+    type=click.FloatRange(min=0, min_open=True),
+    default=DEFAULT_WATCH_INTERVAL,
+    show_default=True,
+    help="Seconds between the checks of the watched files",
 )
 @click.option(
-    "--update/--no-update",
-    default=False,
-    help="Boolean indicating if the configuration should be updated",
+    "--port",
+    type=click.IntRange(min=1, max=65535),
+    default=None,
+    help=(
+        "Local port receiving the push notifications that refresh a repository"
+    ),
 )
-def main(
-    config: str,
-    cache: str,
+def watch(  # noqa: PLR0913
+    template: str | None,
+    output: str | None,
+    manifest: str | None,
+    interval: float,
+    port: int | None,
     datasources: str,
-    template: str,
-    output: str,
-    *,
-    caching: bool,
-    verbose: bool,
-    update: bool,
+    **options: typing.Any,
 ) -> None:
-    if not verbose:
-        disable_logger()
-
-    configuration = Configuration(config)
-    Cache(cache, disabled=(not caching))
-
-    with Path(template).open(mode="r") as template_file:
-        template = template_file.read()
-        readme = parse(datasources, template)
+    renders = read_manifest(manifest) if manifest else []
+    if template and output:
+        renders.append((template, output))
+    elif template or output:
+        message = "--template and --output should be used together."
+        raise click.UsageError(message)
 
-    with Path(output).open(mode="w") as output_file:
-        output_file.write(readme)
+    if not renders:
+        message = "A template or a manifest should be given."
+        raise click.UsageError(message)
 
-    configuration.update_config(save=update)
+    with start_session(**options):
+        Watcher(datasources, renders, options["config"]).run(
+            interval,
+            port=port,
+        )
 
 
 if __name__ == "__main__":
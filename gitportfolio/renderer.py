@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import filecmp
+import queue
+import shutil
+import tempfile
+import threading
+import typing
+from pathlib import Path
+
+from gitportfolio.dsl import render
+from gitportfolio.logger import get_logger
+from gitportfolio.tracing import count, span
+
+if typing.TYPE_CHECKING:
+    from gitportfolio.dsl import EvaluationContext
+
+QUEUE_SIZE = 64
+DEFAULT_OUTPUT_MODE = 0o644
+
+
+class SegmentWriter(threading.Thread):
+    file: typing.IO[str]
+    segments: queue.Queue[str | None]
+    error: BaseException | None
+
+    def __init__(self, file: typing.IO[str]) -> None:
+        super().__init__()
+
+        self.file = file
+        self.segments = queue.Queue(maxsize=QUEUE_SIZE)
+        self.error = None
+
+    def run(self) -> None:
+        while (segment := self.segments.get()) is not None:
+            # After a failure, the segments are only consumed to unblock the
+            # renderer.
+            if self.error is not None:
+                continue
+
+            try:
+                self.file.write(segment)
+            except OSError as e:
+                self.error = e
+
+    def write(self, segment: str) -> None:
+        self.segments.put(segment)
+
+    def close(self) -> None:
+        self.segments.put(None)
+        self.join()
+
+        if self.error is not None:
+            raise self.error
+
+
+def render_file(
+    custom_datasources_folder: str,
+    template: str,
+    output: str,
+    context: EvaluationContext | None = None,
+) -> None:
+    output_path = Path(output)
+    with span("io.read"):
+        text = Path(template).read_text()
+
+    count("io.bytes_read", len(text.encode()))
+
+    # The output is written progressively in a temporary file, which replaces
+    # the output file only if the rendering succeeds.
+    temp_file = tempfile.NamedTemporaryFile(  # noqa: SIM115
+        mode="w",
+        dir=output_path.parent,
+        prefix=f".{output_path.name}.",
+        suffix=".tmp",
+        delete=False,
+    )
+    temp_path = Path(temp_file.name)
+
+    try:
+        with temp_file:
+            writer = SegmentWriter(temp_file)
+            writer.start()
+
+            try:
+                # The placeholders are evaluated while the previous segments
+                # are written.
+                with span("render"):
+                    for segment in render(
+                        custom_datasources_folder,
+                        text,
+                        context,
+                    ):
+                        writer.write(segment)
+            finally:
+                with span("io.flush"):
+                    writer.close()
+
+        count("io.bytes_written", temp_path.stat().st_size)
+
+        # An unchanged output is not rewritten, so that its modification time
+        # is kept and no empty commit is created from it.
+        if output_path.exists() and filecmp.cmp(
+            temp_path,
+            output_path,
+            shallow=False,
+        ):
+            temp_path.unlink()
+
+            get_logger().info(f'The output "{output}" is unchanged.')
+
+            return
+
+        if output_path.exists():
+            shutil.copymode(output_path, temp_path)
+        else:
+            temp_path.chmod(DEFAULT_OUTPUT_MODE)
+
+        temp_path.replace(output_path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+
+        raise
+
+    get_logger().info(f'The output was written into "{output}".')
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import threading
+import time
+import typing
+
+from gitportfolio.exceptions import GitPortfolioError
+from gitportfolio.logger import get_logger
+from gitportfolio.tracing import count, span
+
+DEFAULT_RATE_LIMIT_RESERVE = 100
+RESET_MARGIN = 1
+
+T = typing.TypeVar("T")
+RateLimitGetter = typing.Callable[[], tuple[int, float]]
+
+
+class RequestScheduler:
+    get_rate_limit: RateLimitGetter
+    reserve: int
+    remaining: int | None
+    reset_time: float
+    next_request_time: float
+    requests_count: int
+    not_modified_count: int
+    skipped_count: int
+    waiting_time: float
+    lock: threading.Lock
+
+    def __init__(
+        self,
+        get_rate_limit: RateLimitGetter,
+        reserve: int = DEFAULT_RATE_LIMIT_RESERVE,
+    ) -> None:
+        self.get_rate_limit = get_rate_limit
+        self.reserve = reserve
+        self.remaining = None
+        self.reset_time = 0
+        self.next_request_time = 0
+        self.requests_count = 0
+        self.not_modified_count = 0
+        self.skipped_count = 0
+        self.waiting_time = 0
+        self.lock = threading.Lock()
+
+    def update_rate_limit(self, remaining: int, reset_time: float) -> None:
+        # The rate limit is unknown until the first response.
+        if remaining < 0:
+            return
+
+        with self.lock:
+            if self.remaining is None or reset_time > self.reset_time:
+                self.remaining = remaining
+                self.reset_time = reset_time
+            else:
+                # Concurrent responses may be received out of order.
+                self.remaining = min(self.remaining, remaining)
+
+    def acquire(self, *, essential: bool) -> None:
+        with self.lock:
+            if self.remaining is not None:
+                if not essential and self.remaining <= self.reserve:
+                    self.skipped_count += 1
+                    count("github.skipped_requests")
+
+                    raise RequestBudgetExhaustedError
+
+                if self.remaining <= 0:
+                    self.wait_for_reset()
+                else:
+                    if self.remaining <= self.reserve:
+                        self.pace(self.remaining)
+
+                    self.remaining -= 1
+
+            self.requests_count += 1
+            count("github.requests")
+
+    def pace(self, remaining: int) -> None:
+        # Once the budget is down to the reserve, the essential requests are
+        # spread evenly until the reset, instead of exhausting it at once.
+        now = time.time()
+        interval = max(self.reset_time - now, 0) / remaining
+
+        delay = self.next_request_time - now
+        if delay > 0:
+            with span("github.rate_limit_wait"):
+                time.sleep(delay)
+
+            self.waiting_time += delay
+
+        self.next_request_time = max(now, self.next_request_time) + interval
+
+    def refund(self) -> None:
+        # The "304 Not Modified" responses do not count against the rate
+        # limit.
+        with self.lock:
+            if self.remaining is not None:
+                self.remaining += 1
+
+            self.requests_count -= 1
+            self.not_modified_count += 1
+
+        count("github.requests", -1)
+        count("github.not_modified_requests")
+
+    def wait_for_reset(self) -> None:
+        # The lock is kept while waiting, so that all requests are paused.
+        delay = max(self.reset_time - time.time(), 0) + RESET_MARGIN
+
+        get_logger().warning(
+            "The rate limit of GitHub is exhausted. The requests will be"
+            f" paused for {delay:.0f} seconds, until it is reset.",
+        )
+
+        with span("github.rate_limit_wait"):
+            time.sleep(delay)
+
+        self.waiting_time += delay
+        self.remaining = None
+
+    def run(
+        self,
+        request: typing.Callable[[], T],
+        *,
+        essential: bool = True,
+    ) -> T:
+        self.acquire(essential=essential)
+
+        try:
+            with span("github.request"):
+                return request()
+        finally:
+            self.update_rate_limit(*self.get_rate_limit())
+
+    def report(self) -> None:
+        get_logger().info(
+            f"{self.requests_count} requests counted against the rate limit"
+            f" of GitHub and {self.waiting_time:.1f} seconds were spent"
+            " waiting for it to be reset.",
+        )
+
+        if self.not_modified_count:
+            get_logger().info(
+                f"{self.not_modified_count} other requests were answered with"
+                " unchanged data, which is not counted.",
+            )
+
+        if self.skipped_count:
+            get_logger().warning(
+                f"{self.skipped_count} optional requests were skipped to keep"
+                " the rate limit for the essential ones. Cached data was used"
+                " instead.",
+            )
+
+
+class RequestBudgetExhaustedError(GitPortfolioError):
+    """The rate limit left is reserved to essential requests."""
@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import json
+import typing
+import zlib
+from dataclasses import MISSING, fields
+from datetime import datetime
+
+from gitportfolio.exceptions import GitPortfolioError
+from gitportfolio.facade import OrganisationFacade, RepositoryFacade
+
+# Incremented when the encoding changes in a way not covered by the schemas.
+FORMAT_VERSION = 3
+
+DATETIME_TAG = "$datetime"
+FACADE_TAG = "$facade"
+VALUES_KEY = "values"
+DOCUMENT_SEPARATOR = b"\n"
+
+FACADES: dict[str, type] = {
+    facade.__name__: facade
+    for facade in (RepositoryFacade, OrganisationFacade)
+}
+
+Schemas = dict[str, list[str]]
+Builder = typing.Callable[[list], typing.Any]
+
+
+def get_schemas() -> Schemas:
+    return {
+        name: [field.name for field in fields(facade)]
+        for name, facade in FACADES.items()
+    }
+
+
+def get_datetime_members(facade: type) -> frozenset[str]:
+    return frozenset(
+        field.name for field in fields(facade) if field.type == "datetime"
+    )
+
+
+SCHEMAS = get_schemas()
+DATETIME_MEMBERS = {
+    name: get_datetime_members(facade) for name, facade in FACADES.items()
+}
+
+
+def encode_datetime(value: datetime | None) -> str | None:
+    return None if value is None else value.isoformat()
+
+
+def decode_datetime(value: str | None) -> datetime | None:
+    return None if value is None else datetime.fromisoformat(value)
+
+
+def encode_facade(facade: typing.Any) -> list:
+    name = type(facade).__name__
+    datetime_members = DATETIME_MEMBERS[name]
+
+    return [
+        (
+            encode_datetime(getattr(facade, member))
+            if member in datetime_members
+            else getattr(facade, member)
+        )
+        for member in SCHEMAS[name]
+    ]
+
+
+def encode_tagged(value: typing.Any) -> dict:
+    if isinstance(value, datetime):
+        return {DATETIME_TAG: value.isoformat()}
+
+    name = type(value).__name__
+    if FACADES.get(name, None) is type(value):
+        return {FACADE_TAG: name, VALUES_KEY: encode_facade(value)}
+
+    raise UnserializableObjectError(name)
+
+
+def dumps(value: typing.Any) -> bytes:
+    return json.dumps(
+        value,
+        default=encode_tagged,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode()
+
+
+def encode_record(record: typing.Any) -> tuple[str, bytes]:
+    # The facades, which are most of the records, are stored as bare arrays
+    # of members, whose names are given by the schemas.
+    name = type(record).__name__
+    if FACADES.get(name, None) is type(record):
+        return name, dumps(encode_facade(record))
+
+    return "", dumps(record)
+
+
+def create_builder(name: str, stored_members: list[str]) -> Builder:
+    facade = FACADES.get(name, None)
+    if facade is None:
+        raise IncompatibleCacheError
+
+    datetime_indexes = [
+        index
+        for index, member in enumerate(stored_members)
+        if member in DATETIME_MEMBERS[name]
+    ]
+
+    def decode_datetimes(values: list) -> list:
+        for index in datetime_indexes:
+            values[index] = decode_datetime(values[index])
+
+        return values
+
+    if stored_members == SCHEMAS[name]:
+        return lambda values: facade(*decode_datetimes(values))
+
+    # The members added since the objects were cached should have a default
+    # value, while the removed ones are dropped.
+    required_members = {
+        field.name
+        for field in fields(facade)
+        if field.default is MISSING and field.default_factory is MISSING
+    }
+    if not required_members.issubset(stored_members):
+        raise IncompatibleCacheError
+
+    current_members = set(SCHEMAS[name])
+    kept_members = [
+        (index, member)
+        for index, member in enumerate(stored_members)
+        if member in current_members
+    ]
+
+    def build(values: list) -> typing.Any:
+        values = decode_datetimes(values)
+
+        return facade(
+            **{member: values[index] for index, member in kept_members},
+        )
+
+    return build
+
+
+class Decoder:
+    builders: dict[str, Builder]
+
+    def __init__(self, schemas: Schemas | None = None) -> None:
+        self.builders = {
+            name: create_builder(name, members)
+            for name, members in (schemas or SCHEMAS).items()
+        }
+
+    def get_builder(self, name: str) -> Builder:
+        builder = self.builders.get(name, None)
+        if builder is None:
+            raise IncompatibleCacheError
+
+        return builder
+
+    def decode_tagged(self, obj: dict) -> typing.Any:
+        if DATETIME_TAG in obj and len(obj) == 1:
+            return decode_datetime(obj[DATETIME_TAG])
+
+        if FACADE_TAG in obj and len(obj) == 2:  # noqa: PLR2004
+            return self.get_builder(obj[FACADE_TAG])(obj[VALUES_KEY])
+
+        return obj
+
+    def loads(self, data: bytes | str) -> typing.Any:
+        try:
+            return json.loads(data, object_hook=self.decode_tagged)
+        except (ValueError, TypeError, KeyError, IndexError) as error:
+            raise IncompatibleCacheError from error
+
+    def decode_record(self, kind: str, data: bytes) -> typing.Any:
+        if not kind:
+            return self.loads(data)
+
+        builder = self.get_builder(kind)
+        try:
+            return builder(json.loads(data))
+        except (ValueError, TypeError, KeyError, IndexError) as error:
+            raise IncompatibleCacheError from error
+
+
+def get_checksum(data: bytes) -> int:
+    return zlib.crc32(data)
+
+
+def encode_header(checksum: int | None = None) -> bytes:
+    header: dict[str, typing.Any] = {
+        "version": FORMAT_VERSION,
+        "schemas": SCHEMAS,
+    }
+    if checksum is not None:
+        header["checksum"] = checksum
+
+    return dumps(header)
+
+
+def read_header(data: bytes | str) -> dict:
+    try:
+        header = json.loads(data)
+    except ValueError as error:
+        raise IncompatibleCacheError from error
+
+    if (
+        not isinstance(header, dict)
+        or header.get("version", None) != FORMAT_VERSION
+    ):
+        raise IncompatibleCacheError
+
+    return header
+
+
+def decode_header(data: bytes | str) -> Decoder:
+    return Decoder(read_header(data).get("schemas", None))
+
+
+def encode_document(obj: typing.Any) -> bytes:
+    # The header is on its own line, so that an incompatible document is
+    # discarded without decoding its data. It also holds the checksum of the
+    # data, which detects the truncated or damaged documents.
+    body = dumps(obj)
+
+    return encode_header(get_checksum(body)) + DOCUMENT_SEPARATOR + body
+
+
+def decode_document(data: bytes) -> typing.Any:
+    header_data, separator, body = data.partition(DOCUMENT_SEPARATOR)
+    if not separator:
+        raise CorruptedCacheError
+
+    header = read_header(header_data)
+    if header.get("checksum", None) != get_checksum(body):
+        raise CorruptedCacheError
+
+    return Decoder(header.get("schemas", None)).loads(body)
+
+
+class UnserializableObjectError(GitPortfolioError, TypeError):
+    """The object can not be stored into the cache."""
+
+
+class IncompatibleCacheError(GitPortfolioError):
+    """The cached data was written in an incompatible format."""
+
+
+class CorruptedCacheError(IncompatibleCacheError):
+    """The cached data is truncated or damaged."""
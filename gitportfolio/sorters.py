@@ -1,11 +1,102 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import heapq
+from operator import attrgetter
+from typing import Any, Callable
 
+from gitportfolio.facade import REPOSITORY_MEMBERS, RepositoryFacade
 from gitportfolio.logger import get_logger
 
-if TYPE_CHECKING:
-    from facade import RepositoryFacade
+RepositoryFacadeKey = Callable[[RepositoryFacade], Any]
+
+MEMBER_NAMES = frozenset(REPOSITORY_MEMBERS)
+
+
+def get_member_getter(member_name: str) -> RepositoryFacadeKey:
+    # Unknown members are equal for all repositories, keeping their order.
+    if member_name not in MEMBER_NAMES:
+        return lambda _: 0
+
+    return attrgetter(member_name)
+
+
+class RepositoryFacadeSortKey:
+    member_name: str
+    reverse: bool
+
+    def __init__(self, member_name: str, *, reverse: bool = False) -> None:
+        self.member_name = member_name
+        self.reverse = reverse
+
+
+class Descending:
+    __slots__ = ("value",)
+
+    value: Any
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+    def __lt__(self, other: Descending) -> bool:
+        return other.value < self.value
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Descending) and self.value == other.value
+
+    def __hash__(self) -> int:
+        return hash(self.value)
+
+
+def get_top_repos(
+    repos: list[RepositoryFacade],
+    keys: tuple[RepositoryFacadeSortKey, ...],
+    limit: int,
+) -> list[RepositoryFacade]:
+    # The heap selections are stable, as the full sorts.
+    directions = {key.reverse for key in keys}
+    if len(directions) == 1:
+        names = [key.member_name for key in keys]
+        if MEMBER_NAMES.issuperset(names):
+            select = heapq.nlargest if directions.pop() else heapq.nsmallest
+
+            return select(limit, repos, key=attrgetter(*names))
+
+    getters = [
+        (get_member_getter(key.member_name), key.reverse) for key in keys
+    ]
+
+    def get_key(repo: RepositoryFacade) -> tuple:
+        return tuple(
+            Descending(getter(repo)) if reverse else getter(repo)
+            for getter, reverse in getters
+        )
+
+    return heapq.nsmallest(limit, repos, key=get_key)
+
+
+def sort_repos(
+    repos: list[RepositoryFacade],
+    *keys: RepositoryFacadeSortKey,
+    limit: int | None = None,
+) -> list[RepositoryFacade]:
+    get_logger().info(
+        "A list of repositories will be sorted by"
+        f" {', '.join(key.member_name for key in keys)}.",
+    )
+
+    if limit is not None:
+        return get_top_repos(repos, keys, limit)
+
+    # Successive stable sorts, from the least significant key, allow a
+    # different direction for each key.
+    sorted_repos = list(repos)
+    for key in reversed(keys):
+        sorted_repos.sort(
+            key=get_member_getter(key.member_name),
+            reverse=key.reverse,
+        )
+
+    return sorted_repos
 
 
 def sort_repos_by_member(
@@ -14,7 +105,7 @@ def sort_repos_by_member(
     *,
     reverse: bool = False,
 ) -> list[RepositoryFacade]:
-    repos.sort(key=lambda x: x.as_dict().get(member_name, 0), reverse=reverse)
+    repos.sort(key=get_member_getter(member_name), reverse=reverse)
 
     get_logger().info("A list of repositories was filtered.")
 
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import typing
+from array import array
+
+if typing.TYPE_CHECKING:
+    from gitportfolio.facade import RepositoryFacade
+
+# Masks are integers whose bit i is set if the repository i is selected. They
+# are combined with &, | and ~ (the latter being followed by a & with the mask
+# of all repositories).
+TO_SELECTORS = bytes.maketrans(b"01", b"\x00\x01")
+FROM_SELECTORS = bytes.maketrans(b"\x00\x01", b"01")
+
+FLAG_COLUMNS = ["is_private", "is_fork", "is_archived", "is_shown"]
+
+
+def selectors_to_mask(selectors: bytearray) -> int:
+    if not selectors:
+        return 0
+
+    return int(bytes(selectors[::-1]).translate(FROM_SELECTORS), 2)
+
+
+class DictionaryColumn:
+    values: list[str]
+    masks: dict[str, int]
+
+    def __init__(self, rows: typing.Iterable[typing.Iterable[str]]) -> None:
+        selectors: dict[str, bytearray] = {}
+
+        rows = list(rows)
+        for index, row_values in enumerate(rows):
+            for value in row_values:
+                if value not in selectors:
+                    selectors[value] = bytearray(len(rows))
+
+                selectors[value][index] = 1
+
+        self.values = list(selectors.keys())
+        self.masks = {
+            value: selectors_to_mask(value_selectors)
+            for value, value_selectors in selectors.items()
+        }
+
+    def get_mask(self, value: str) -> int:
+        return self.masks.get(value, 0)
+
+
+class RepositoryTable:
+    repos: list[RepositoryFacade]
+    size: int
+    numeric_columns: dict[str, array]
+    text_columns: dict[str, list[str]]
+    flags: dict[str, int]
+    dictionaries: dict[str, DictionaryColumn]
+
+    def __init__(self, repos: list[RepositoryFacade]) -> None:
+        self.repos = list(repos)
+        self.size = len(self.repos)
+
+        self.numeric_columns = {
+            "stars_count": array("q", [r.stars_count for r in self.repos]),
+            "creation_date": array(
+                "d",
+                [r.creation_date.timestamp() for r in self.repos],
+            ),
+            "last_push": array(
+                "d",
+                [
+                    r.last_push.timestamp() if r.last_push else 0
+                    for r in self.repos
+                ],
+            ),
+        }
+        self.text_columns = {
+            "name": [r.name for r in self.repos],
+            "owner": [r.owner for r in self.repos],
+        }
+        self.flags = {
+            flag: selectors_to_mask(
+                bytearray(getattr(r, flag) for r in self.repos),
+            )
+            for flag in FLAG_COLUMNS
+        }
+        self.dictionaries = {
+            "owner": DictionaryColumn([r.owner] for r in self.repos),
+            "languages": DictionaryColumn(r.languages for r in self.repos),
+            "tags": DictionaryColumn(r.tags for r in self.repos),
+        }
+
+    @property
+    def full_mask(self) -> int:
+        return (1 << self.size) - 1
+
+    def invert(self, mask: int) -> int:
+        return ~mask & self.full_mask
+
+    def flag(self, name: str, *, value: bool = True) -> int:
+        mask = self.flags[name]
+
+        return mask if value else self.invert(mask)
+
+    def owner(self, owner: str) -> int:
+        return self.dictionaries["owner"].get_mask(owner)
+
+    def language(self, language: str) -> int:
+        return self.dictionaries["languages"].get_mask(language)
+
+    def tags(self, tags: typing.Iterable[str]) -> int:
+        mask = 0
+        for tag in tags:
+            mask |= self.dictionaries["tags"].get_mask(tag)
+
+        return mask
+
+    def count(self, mask: int | None = None) -> int:
+        return self.size if mask is None else mask.bit_count()
+
+    def get_selectors(self, mask: int) -> bytes:
+        return (
+            format(mask, "b")
+            .zfill(self.size)[::-1]
+            .encode()
+            .translate(TO_SELECTORS)
+        )
+
+    def select(self, mask: int | None = None) -> list[RepositoryFacade]:
+        if mask is None:
+            return list(self.repos)
+
+        return list(itertools.compress(self.repos, self.get_selectors(mask)))
+
+    def get_column(self, column: str) -> typing.Sequence:
+        if column in self.numeric_columns:
+            return self.numeric_columns[column]
+
+        return self.text_columns[column]
+
+    def argsort(
+        self,
+        column: str,
+        mask: int | None = None,
+        *,
+        reverse: bool = False,
+        limit: int | None = None,
+    ) -> list[int]:
+        values = self.get_column(column)
+
+        indexes: typing.Iterable[int] = range(self.size)
+        if mask is not None:
+            indexes = itertools.compress(indexes, self.get_selectors(mask))
+
+        if limit is not None:
+            select = heapq.nlargest if reverse else heapq.nsmallest
+
+            return select(limit, indexes, key=values.__getitem__)
+
+        return sorted(indexes, key=values.__getitem__, reverse=reverse)
+
+    def sort(
+        self,
+        column: str,
+        mask: int | None = None,
+        *,
+        reverse: bool = False,
+        limit: int | None = None,
+    ) -> list[RepositoryFacade]:
+        return [
+            self.repos[index]
+            for index in self.argsort(
+                column,
+                mask,
+                reverse=reverse,
+                limit=limit,
+            )
+        ]
+
+    def sum_column(self, column: str, mask: int | None = None) -> float:
+        values = self.numeric_columns[column]
+
+        if mask is None:
+            return sum(values)
+
+        return sum(itertools.compress(values, self.get_selectors(mask)))
+
+    def count_by(
+        self,
+        column: str,
+        mask: int | None = None,
+    ) -> dict[str, int]:
+        masks = self.dictionaries[column].masks
+        if mask is None:
+            mask = self.full_mask
+
+        return {
+            value: (value_mask & mask).bit_count()
+            for value, value_mask in masks.items()
+        }
+
+    def sum_by(
+        self,
+        column: str,
+        summed_column: str,
+        mask: int | None = None,
+    ) -> dict[str, float]:
+        masks = self.dictionaries[column].masks
+        if mask is None:
+            mask = self.full_mask
+
+        return {
+            value: self.sum_column(summed_column, value_mask & mask)
+            for value, value_mask in masks.items()
+        }
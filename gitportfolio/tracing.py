@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import threading
+import time
+import typing
+from pathlib import Path
+
+from gitportfolio.logger import get_logger
+
+NULL_SPAN = contextlib.nullcontext()
+
+enabled = False
+start_time = 0.0
+spans: dict[str, list[float]] = {}
+counters: dict[str, int] = {}
+lock = threading.Lock()
+
+
+def enable_tracing() -> None:
+    global enabled, start_time  # noqa: PLW0603
+
+    with lock:
+        spans.clear()
+        counters.clear()
+
+        start_time = time.perf_counter()
+        enabled = True
+
+
+def is_tracing_enabled() -> bool:
+    return enabled
+
+
+class Span:
+    __slots__ = ("name", "start")
+
+    name: str
+    start: float
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.start = 0
+
+    def __enter__(self) -> Span:
+        self.start = time.perf_counter()
+
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        duration = time.perf_counter() - self.start
+
+        with lock:
+            # The count, total and maximum durations of the span
+            statistics = spans.setdefault(self.name, [0, 0, 0])
+            statistics[0] += 1
+            statistics[1] += duration
+            statistics[2] = max(statistics[2], duration)
+
+
+def span(name: str) -> typing.ContextManager:
+    # No time is measured when the tracing is disabled.
+    if not enabled:
+        return NULL_SPAN
+
+    return Span(name)
+
+
+def count(name: str, value: int = 1) -> None:
+    if not enabled:
+        return
+
+    with lock:
+        counters[name] = counters.get(name, 0) + value
+
+
+def get_report() -> dict[str, typing.Any]:
+    with lock:
+        return {
+            "seconds": time.perf_counter() - start_time,
+            "spans": {
+                name: {
+                    "count": int(span_count),
+                    "seconds": total,
+                    "max_seconds": maximum,
+                }
+                for name, (span_count, total, maximum) in sorted(
+                    spans.items(),
+                )
+            },
+            "counters": dict(sorted(counters.items())),
+        }
+
+
+def write_report(filename: str) -> None:
+    Path(filename).write_text(json.dumps(get_report(), indent=4) + "\n")
+
+    get_logger().info(f'The profile of the run was written into "{filename}".')
@@ -0,0 +1,306 @@
+from __future__ import annotations
+
+import importlib
+import json
+import queue
+import sys
+import threading
+import time
+import typing
+from http import HTTPStatus
+from pathlib import Path
+
+from gitportfolio.config import Configuration
+from gitportfolio.dsl import (
+    BUILTIN_DATA_SOURCES,
+    EvaluationContext,
+    compile_template,
+    get_data_source_names,
+)
+from gitportfolio.github import refresh_repo
+from gitportfolio.logger import get_logger
+from gitportfolio.renderer import render_file
+
+if typing.TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+DEFAULT_WATCH_INTERVAL = 0.5
+DEFAULT_WEBHOOK_HOST = "127.0.0.1"
+MAX_NOTIFICATION_SIZE = 1024 * 1024
+DATASOURCES_PATTERN = "*.py"
+
+
+def create_notification_server(
+    host: str,
+    port: int,
+    notifications: queue.Queue[str],
+) -> ThreadingHTTPServer:
+    # The HTTP server is only imported when the notifications are enabled.
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class NotificationHandler(BaseHTTPRequestHandler):
+        def read_full_name(self) -> str | None:
+            # The notifications follow the payloads of GitHub's webhooks, such
+            # as the push events, which contain the full name of the
+            # repository.
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+            except ValueError:
+                return None
+
+            if length > MAX_NOTIFICATION_SIZE:
+                return None
+
+            try:
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                full_name = payload["repository"]["full_name"]
+            except (ValueError, KeyError, TypeError):
+                return None
+
+            return full_name if isinstance(full_name, str) else None
+
+        def do_POST(self) -> None:
+            full_name = self.read_full_name()
+            if full_name is None:
+                self.send_response(HTTPStatus.BAD_REQUEST)
+                self.end_headers()
+
+                return
+
+            notifications.put(full_name)
+
+            self.send_response(HTTPStatus.ACCEPTED)
+            self.end_headers()
+
+        def log_message(
+            self,
+            format: str,  # noqa: A002
+            *args: object,
+        ) -> None:
+            get_logger().info("Notification: " + format, *args)
+
+    return ThreadingHTTPServer((host, port), NotificationHandler)
+
+
+class Watcher:
+    custom_datasources_folder: str
+    renders: list[tuple[str, str]]
+    config_path: Path
+    context: EvaluationContext
+    modification_times: dict[Path, float | None]
+    notifications: queue.Queue[str]
+
+    def __init__(
+        self,
+        custom_datasources_folder: str,
+        renders: list[tuple[str, str]],
+        config: str,
+    ) -> None:
+        self.custom_datasources_folder = custom_datasources_folder
+        self.renders = renders
+        self.config_path = Path(config)
+        self.context = EvaluationContext()
+        self.notifications = queue.Queue()
+        self.modification_times = self.get_modification_times()
+
+    def get_watched_paths(self) -> set[Path]:
+        paths = {Path(template) for template, _ in self.renders}
+        paths.add(self.config_path)
+        paths.update(
+            Path(self.custom_datasources_folder).glob(DATASOURCES_PATTERN),
+        )
+
+        return paths
+
+    def get_modification_times(self) -> dict[Path, float | None]:
+        modification_times: dict[Path, float | None] = {}
+        for path in self.get_watched_paths():
+            try:
+                modification_times[path] = path.stat().st_mtime
+            except FileNotFoundError:
+                modification_times[path] = None
+
+        return modification_times
+
+    def get_changed_paths(self) -> set[Path]:
+        modification_times = self.get_modification_times()
+
+        changed_paths = {
+            path
+            for path in modification_times.keys() | self.modification_times
+            if modification_times.get(path, None)
+            != self.modification_times.get(path, None)
+        }
+        self.modification_times = modification_times
+
+        return changed_paths
+
+    def get_data_source_names(self) -> dict[tuple[str, str], set[str]]:
+        data_source_names = {}
+        for render in self.renders:
+            try:
+                text = Path(render[0]).read_text()
+            except FileNotFoundError:
+                continue
+
+            data_source_names[render] = get_data_source_names(
+                compile_template(text),
+            )
+
+        return data_source_names
+
+    def reload_datasources(self, paths: set[Path]) -> set[str]:
+        importlib.invalidate_caches()
+
+        names = {path.stem for path in paths}
+        for name in names:
+            module = sys.modules.get(name, None)
+            if module is not None:
+                importlib.reload(module)
+
+        # A changed module that is not a data source may be imported by any
+        # of them.
+        custom_names = (
+            set().union(*self.get_data_source_names().values())
+            - BUILTIN_DATA_SOURCES
+        )
+
+        return names if names <= custom_names else custom_names
+
+    def handle_changes(self, changed_paths: set[Path]) -> None:
+        templates = {Path(template) for template, _ in self.renders}
+        renders: list[tuple[str, str]] = []
+
+        if self.config_path in changed_paths:
+            get_logger().info("The configuration changed.")
+
+            Configuration().reload()
+            self.context.invalidate()
+
+            renders = self.renders
+        else:
+            datasources = {
+                path
+                for path in changed_paths
+                if path not in templates and path.suffix == ".py"
+            }
+            if datasources:
+                names = self.reload_datasources(datasources)
+                self.context.invalidate(names)
+
+                renders += [
+                    render
+                    for render, used_names in (
+                        self.get_data_source_names().items()
+                    )
+                    if used_names & names
+                ]
+
+            renders += [
+                render
+                for render in self.renders
+                if Path(render[0]) in changed_paths and render not in renders
+            ]
+
+        self.render(renders)
+
+    def refresh_repo(self, full_name: str) -> None:
+        get_logger().info(
+            f'A notification was received for the repository "{full_name}".',
+        )
+
+        self.context.update_repo(full_name, refresh_repo(full_name))
+
+        self.render(self.renders)
+
+    def render(self, renders: list[tuple[str, str]]) -> None:
+        if not renders:
+            return
+
+        # The date of the rendering is the only data source that changes
+        # without a notification.
+        self.context.invalidate(["now"])
+
+        start = time.perf_counter()
+        for template, output in renders:
+            try:
+                render_file(
+                    self.custom_datasources_folder,
+                    template,
+                    output,
+                    self.context,
+                )
+            except Exception:  # noqa: BLE001
+                get_logger().error(
+                    f'The template "{template}" could not be rendered.',
+                    exc_info=True,
+                )
+
+        get_logger().info(
+            f"{len(renders)} outputs were rendered in"
+            f" {(time.perf_counter() - start) * 1000:.0f} milliseconds.",
+        )
+
+    def start_server(self, host: str, port: int) -> ThreadingHTTPServer:
+        server = create_notification_server(host, port, self.notifications)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        get_logger().info(
+            f"The notifications are received on http://{host}:{port}.",
+        )
+
+        return server
+
+    def handle_notification(self, timeout: float) -> None:
+        try:
+            full_name = self.notifications.get(timeout=timeout)
+        except queue.Empty:
+            return
+
+        try:
+            self.refresh_repo(full_name)
+        except Exception:  # noqa: BLE001
+            get_logger().error(
+                f'The repository "{full_name}" could not be refreshed.',
+                exc_info=True,
+            )
+
+    def handle_file_changes(self) -> None:
+        changed_paths = self.get_changed_paths()
+        if not changed_paths:
+            return
+
+        try:
+            self.handle_changes(changed_paths)
+        except Exception:  # noqa: BLE001
+            get_logger().error(
+                "The changes of the watched files could not be handled.",
+                exc_info=True,
+            )
+
+    def run(
+        self,
+        interval: float = DEFAULT_WATCH_INTERVAL,
+        host: str = DEFAULT_WEBHOOK_HOST,
+        port: int | None = None,
+    ) -> None:
+        server = self.start_server(host, port) if port is not None else None
+
+        self.render(self.renders)
+
+        get_logger().info(
+            f"{len(self.modification_times)} files are watched for changes.",
+        )
+
+        try:
+            while True:
+                # The notifications are handled as soon as they are received,
+                # while the files are checked at each interval.
+                self.handle_notification(interval)
+                self.handle_file_changes()
+        except KeyboardInterrupt:
+            get_logger().info("The watch was stopped.")
+        finally:
+            if server is not None:
+                server.shutdown()
+                server.server_close()
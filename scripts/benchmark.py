@@ -0,0 +1,480 @@
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import typing
+from pathlib import Path
+
+import click
+import yaml
+from tabulate import tabulate
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from github_stub import (
+    RATE_LIMIT,
+    GitHubStubServer,
+    SyntheticAccount,
+)
+
+STUB_PAT = "stub-personal-access-token"
+# Each scenario requests at most the languages of every repository, along with
+# the pages of the repositories and the organisations.
+REQUESTS_PER_REPOSITORY = 2
+STARTUP_CODE = """
+import resource
+import gitportfolio.main
+
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+TEMPLATE = """# Portfolio
+
+Updated on <!-- gitportfolio: now|to_utc_string -->.
+
+## Organisations (<!-- gitportfolio: get_orgs|count -->)
+
+<!-- gitportfolio: get_orgs|to_list -->
+
+## Repositories
+
+- All: <!-- gitportfolio: get_repos|count -->
+- Private: <!-- gitportfolio: get_private_repos|count -->
+- Public: <!-- gitportfolio: get_public_repos|count -->
+
+<!-- gitportfolio: get_public_repos|to_repo_table -->
+"""
+MICRO_BENCHMARKS = [
+    "filter_repos",
+    "sort_repos_by_member",
+    "sort_repos",
+    "to_repo_table",
+    "dsl.parse",
+]
+
+
+class Workspace:
+    folder: Path
+    config: Path
+    cache: Path
+    datasources: Path
+    template: Path
+    output: Path
+
+    def __init__(
+        self,
+        folder: str,
+        account: SyntheticAccount,
+        api_url: str,
+    ) -> None:
+        self.folder = Path(folder)
+        self.config = self.folder.joinpath("config.yaml")
+        self.cache = self.folder.joinpath("cache")
+        self.datasources = self.folder.joinpath("datasources")
+        self.template = self.folder.joinpath("TEMPLATE.md")
+        self.output = self.folder.joinpath("README.md")
+
+        self.cache.mkdir()
+        self.datasources.mkdir()
+        self.template.write_text(TEMPLATE)
+
+        # Some organisations are excluded and some repositories are tagged or
+        # hidden, as in real configurations.
+        config = {
+            "orgs": {
+                org["login"]: {"excluded": index % 10 == 0}
+                for index, org in enumerate(account.orgs)
+            },
+            "repos": {
+                repo["name"]: {
+                    "shown": index % 50 != 0,
+                    "tags": ["tool", "research"][: index % 3],
+                }
+                for index, repo in enumerate(account.repos)
+                if index % 5 == 0
+            },
+            "tags": {},
+            "fetching": {"api_url": api_url},
+        }
+        self.config.write_text(yaml.dump(config))
+
+
+def run_render(
+    workspace: Workspace,
+    settings: dict[str, typing.Any],
+    results: multiprocessing.Queue,
+) -> None:
+    # Executed in a new process, for isolated singletons and memory usage
+    from gitportfolio.cache import Cache
+    from gitportfolio.config import Configuration
+    from gitportfolio.logger import disable_logger
+    from gitportfolio.renderer import render_file
+
+    os.environ["GITHUB_PAT"] = STUB_PAT
+    disable_logger()
+
+    configuration = Configuration(str(workspace.config))
+    for key, value in settings.items():
+        configuration.override_setting("fetching", key, value)
+    cache = Cache(str(workspace.cache))
+
+    start = time.perf_counter()
+    render_file(
+        str(workspace.datasources),
+        str(workspace.template),
+        str(workspace.output),
+    )
+    cache.wait_for_revalidations()  # type: ignore[attr-defined]
+    seconds = time.perf_counter() - start
+
+    results.put(
+        {
+            "seconds": seconds,
+            "peak_memory_kib": resource.getrusage(
+                resource.RUSAGE_SELF,
+            ).ru_maxrss,
+        },
+    )
+
+
+def run_scenario(
+    name: str,
+    size: int,
+    workspace: Workspace,
+    server: GitHubStubServer,
+    settings: dict[str, typing.Any],
+) -> dict[str, typing.Any]:
+    before = server.get_stats()
+
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(
+        target=run_render,
+        args=(workspace, settings, results),
+    )
+    process.start()
+    result = results.get()
+    process.join()
+
+    after = server.get_stats()
+
+    return {
+        "benchmark": name,
+        "size": size,
+        **result,
+        "requests": after["requests"] - before["requests"],
+        "not_modified": after["not_modified"] - before["not_modified"],
+    }
+
+
+def run_end_to_end(
+    size: int,
+    orgs_count: int,
+    backend: str,
+) -> list[dict[str, typing.Any]]:
+    account = SyntheticAccount(size, orgs_count)
+    # The rate limit grows with the account, so that the runs never wait for
+    # it to be reset, which would not measure the runs themselves.
+    server = GitHubStubServer(
+        account,
+        rate_limit=RATE_LIMIT + REQUESTS_PER_REPOSITORY * (size + orgs_count),
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    settings = {"backend": backend, "incremental": backend == "rest"}
+
+    rows = []
+    with tempfile.TemporaryDirectory() as folder:
+        workspace = Workspace(folder, account, server.url)
+
+        # The cold run also stores the state used by the incremental one.
+        rows.append(run_scenario("cold", size, workspace, server, settings))
+        rows.append(
+            run_scenario(
+                "warm",
+                size,
+                workspace,
+                server,
+                {**settings, "incremental": False},
+            ),
+        )
+
+        account.push(max(1, size // 100))
+        rows.append(
+            run_scenario("incremental", size, workspace, server, settings),
+        )
+
+    server.shutdown()
+    server.server_close()
+
+    return rows
+
+
+def run_startup(repeat: int) -> dict[str, typing.Any]:
+    # The interpreter is started for each run, as in the CI jobs.
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = subprocess.run(  # noqa: S603
+            [sys.executable, "-c", STARTUP_CODE],
+            cwd=Path(__file__).resolve().parents[1],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout
+        runs.append((time.perf_counter() - start, int(output)))
+
+    seconds, peak = min(runs)
+
+    return {
+        "benchmark": "startup",
+        "size": 0,
+        "seconds": seconds,
+        "peak_memory_kib": peak,
+        "requests": 0,
+        "not_modified": 0,
+    }
+
+
+def measure(
+    function: typing.Callable[[], typing.Any],
+    repeat: int,
+) -> tuple[float, int]:
+    seconds = min(
+        timed(function) for _ in range(repeat)  # type: ignore[type-var]
+    )
+
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return seconds, peak // 1024
+
+
+def timed(function: typing.Callable[[], typing.Any]) -> float:
+    start = time.perf_counter()
+    function()
+
+    return time.perf_counter() - start
+
+
+def run_micro(
+    size: int,
+    orgs_count: int,
+    repeat: int,
+) -> list[dict[str, typing.Any]]:
+    from github import Consts
+
+    from gitportfolio.config import Configuration
+    from gitportfolio.dsl import EvaluationContext, parse
+    from gitportfolio.facade import OrganisationFacade, RepositoryFacade
+    from gitportfolio.filters import (
+        RepositoryFacadePrivateFilter,
+        filter_repos,
+    )
+    from gitportfolio.formatter import to_repo_table
+    from gitportfolio.graphql import parse_datetime
+    from gitportfolio.sorters import (
+        RepositoryFacadeSortKey,
+        sort_repos,
+        sort_repos_by_member,
+    )
+
+    account = SyntheticAccount(size, orgs_count)
+    orgs = [
+        OrganisationFacade(org["name"], org["login"]) for org in account.orgs
+    ]
+    repos = [
+        RepositoryFacade(
+            repo["name"],
+            repo["description"],
+            repo["owner"]["login"],
+            parse_datetime(repo["created_at"]),  # type: ignore[arg-type]
+            parse_datetime(repo["pushed_at"]),  # type: ignore[arg-type]
+            list(account.languages[repo["full_name"]].keys()),
+            ["tool"] if index % 3 == 0 else [],
+            repo["stargazers_count"],
+            repo["private"],
+            repo["fork"],
+            repo["archived"],
+            True,
+        )
+        for index, repo in enumerate(account.repos)
+    ]
+
+    with tempfile.TemporaryDirectory() as folder:
+        workspace = Workspace(folder, account, Consts.DEFAULT_BASE_URL)
+        os.environ["GITHUB_PAT"] = STUB_PAT
+        Configuration(str(workspace.config))
+
+        def parse_template() -> str:
+            # The formatting is measured, instead of the cached outputs.
+            context = EvaluationContext(cache_outputs=False)
+            context.orgs = orgs
+            context.repos = repos
+
+            return parse(str(workspace.datasources), TEMPLATE, context)
+
+        functions: dict[str, typing.Callable[[], typing.Any]] = {
+            "filter_repos": lambda: filter_repos(
+                repos,
+                RepositoryFacadePrivateFilter(is_private=False),
+            ),
+            "sort_repos_by_member": lambda: sort_repos_by_member(
+                list(repos),
+                "stars_count",
+                reverse=True,
+            ),
+            "sort_repos": lambda: sort_repos(
+                repos,
+                RepositoryFacadeSortKey("stars_count", reverse=True),
+                RepositoryFacadeSortKey("last_push", reverse=True),
+                limit=10,
+            ),
+            "to_repo_table": lambda: to_repo_table(repos),
+            "dsl.parse": parse_template,
+        }
+
+        rows = []
+        for name in MICRO_BENCHMARKS:
+            seconds, peak = measure(functions[name], repeat)
+            rows.append(
+                {
+                    "benchmark": name,
+                    "size": size,
+                    "seconds": seconds,
+                    "peak_memory_kib": peak,
+                    "requests": 0,
+                    "not_modified": 0,
+                },
+            )
+
+    return rows
+
+
+def find_regressions(
+    rows: list[dict[str, typing.Any]],
+    baseline: list[dict[str, typing.Any]],
+    threshold: float,
+) -> list[str]:
+    baseline_seconds = {
+        (row["benchmark"], row["size"]): row["seconds"] for row in baseline
+    }
+
+    regressions = []
+    for row in rows:
+        previous = baseline_seconds.get((row["benchmark"], row["size"]), None)
+        if previous and row["seconds"] > previous * threshold:
+            regressions.append(
+                f"{row['benchmark']} ({row['size']} repositories):"
+                f" {previous:.4f}s -> {row['seconds']:.4f}s",
+            )
+
+    return regressions
+
+
+@click.command()
+@click.option(
+    "--sizes",
+    default="10,1000",
+    show_default=True,
+    help="Comma-separated numbers of repositories of the synthetic accounts",
+)
+@click.option(
+    "--orgs",
+    "orgs_count",
+    type=click.IntRange(min=1),
+    default=50,
+    show_default=True,
+    help="Number of organisations of the synthetic accounts",
+)
+@click.option(
+    "--backend",
+    type=click.Choice(["rest", "graphql"]),
+    default="rest",
+    show_default=True,
+    help="API used to fetch data from the stand-in server",
+)
+@click.option(
+    "--repeat",
+    type=click.IntRange(min=1),
+    default=5,
+    show_default=True,
+    help="Number of runs of each micro-benchmark, of which the best is kept",
+)
+@click.option(
+    "--micro/--no-micro",
+    default=True,
+    help="Boolean indicating if the hot paths are benchmarked separately",
+)
+@click.option(
+    "--report",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="JSON file in which the results are saved",
+)
+@click.option(
+    "--baseline",
+    type=click.Path(exists=True, dir_okay=False),
+    default=None,
+    help="JSON report of a previous run, used to detect regressions",
+)
+@click.option(
+    "--threshold",
+    type=click.FloatRange(min=1),
+    default=1.25,
+    show_default=True,
+    help="Slowdown ratio over the baseline considered a regression",
+)
+def main(  # noqa: PLR0913
+    sizes: str,
+    orgs_count: int,
+    backend: str,
+    repeat: int,
+    report: str | None,
+    baseline: str | None,
+    threshold: float,
+    *,
+    micro: bool,
+) -> None:
+    from gitportfolio.logger import disable_logger
+
+    disable_logger()
+
+    rows = [run_startup(repeat)]
+    for size in [int(size) for size in sizes.split(",")]:
+        rows += run_end_to_end(size, orgs_count, backend)
+
+        if micro:
+            rows += run_micro(size, orgs_count, repeat)
+
+    click.echo(tabulate(rows, headers="keys", floatfmt=".4f"))
+
+    if report:
+        Path(report).write_text(json.dumps(rows, indent=4))
+
+    if baseline:
+        regressions = find_regressions(
+            rows,
+            json.loads(Path(baseline).read_text()),
+            threshold,
+        )
+
+        for regression in regressions:
+            click.echo(f"Regression: {regression}", err=True)
+
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,460 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import typing
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import click
+
+LANGUAGES = ["Python", "C", "Go", "Rust", "TypeScript", "Shell", "Java"]
+DEFAULT_PER_PAGE = 30
+MAX_PER_PAGE = 100
+RATE_LIMIT = 5000
+RATE_LIMIT_WINDOW = 3600
+BASE_DATE = datetime(2015, 1, 1, tzinfo=timezone.utc)
+PRIVATE_RATIO = 0.2
+FORK_RATIO = 0.1
+ARCHIVED_RATIO = 0.05
+
+
+def format_date(date: datetime) -> str:
+    return date.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class SyntheticAccount:
+    login: str
+    orgs: list[dict]
+    repos: list[dict]
+    languages: dict[str, dict[str, int]]
+    lock: threading.Lock
+
+    def __init__(
+        self,
+        repos_count: int,
+        orgs_count: int,
+        seed: int = 0,
+    ) -> None:
+        generator = random.Random(seed)
+
+        self.login = "octocat"
+        self.orgs = [
+            {"login": f"org{index}", "name": f"Organisation {index}"}
+            for index in range(orgs_count)
+        ]
+        owners = [self.login] + [org["login"] for org in self.orgs]
+
+        self.repos = []
+        self.languages = {}
+        for index in range(repos_count):
+            owner = owners[index % len(owners)]
+            created_at = BASE_DATE + timedelta(days=generator.randint(0, 2000))
+            pushed_at = created_at + timedelta(days=generator.randint(0, 900))
+
+            self.repos.append(
+                {
+                    "name": f"repository-{index:05d}",
+                    "full_name": f"{owner}/repository-{index:05d}",
+                    "description": f"Synthetic repository number {index}",
+                    "owner": {"login": owner},
+                    "created_at": format_date(created_at),
+                    "pushed_at": format_date(pushed_at),
+                    "stargazers_count": generator.randint(0, 5000),
+                    "private": generator.random() < PRIVATE_RATIO,
+                    "fork": generator.random() < FORK_RATIO,
+                    "archived": generator.random() < ARCHIVED_RATIO,
+                },
+            )
+            self.languages[f"{owner}/repository-{index:05d}"] = {
+                language: generator.randint(1, 100000)
+                for language in generator.sample(
+                    LANGUAGES,
+                    generator.randint(1, 3),
+                )
+            }
+
+        self.repos.sort(key=lambda repo: repo["full_name"])
+        self.lock = threading.Lock()
+
+    def push(self, count: int) -> None:
+        # Simulates new commits on the first repositories
+        pushed_at = format_date(datetime.now(tz=timezone.utc))
+        with self.lock:
+            for repo in self.repos[:count]:
+                repo["pushed_at"] = pushed_at
+                self.languages[repo["full_name"]]["Python"] = 1
+
+
+class GitHubStubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: GitHubStubServer
+
+    def log_message(self, *_: typing.Any) -> None:
+        return
+
+    def send_json(
+        self,
+        data: typing.Any,
+        headers: dict | None = None,
+        *,
+        counted: bool = True,
+    ) -> None:
+        body = json.dumps(data).encode()
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'  # noqa: S324
+
+        not_modified = self.headers.get("If-None-Match", None) == etag
+
+        # As on GitHub, the "304 Not Modified" responses are free.
+        remaining, reset_time = self.server.get_rate_limit()
+        if counted and not not_modified and remaining <= 0:
+            self.send_rate_limit_error(reset_time)
+
+            return
+
+        if counted:
+            remaining, reset_time = self.server.count_request(
+                not_modified=not_modified,
+            )
+
+        self.send_response(304 if not_modified else 200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", etag)
+        self.send_rate_limit_headers(remaining, reset_time)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+
+        if not_modified:
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        else:
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    def send_rate_limit_headers(self, remaining: int, reset_time: int) -> None:
+        self.send_header("X-RateLimit-Limit", str(self.server.rate_limit))
+        self.send_header("X-RateLimit-Remaining", str(remaining))
+        self.send_header("X-RateLimit-Reset", str(reset_time))
+
+    def send_rate_limit_error(self, reset_time: int) -> None:
+        body = json.dumps({"message": "API rate limit exceeded"}).encode()
+
+        self.send_response(403)
+        self.send_header("Content-Type", "application/json")
+        self.send_rate_limit_headers(0, reset_time)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def get_base_url(self) -> str:
+        return f"http://{self.headers['Host']}"
+
+    def get_repo_data(self, repo: dict) -> dict:
+        return {
+            **repo,
+            "url": f"{self.get_base_url()}/repos/{repo['full_name']}",
+        }
+
+    def send_stats(self, _: dict) -> None:
+        self.send_json(self.server.get_stats(), counted=False)
+
+    def send_rate_limit(self, _: dict) -> None:
+        remaining, reset_time = self.server.get_rate_limit()
+        rate = {
+            "limit": self.server.rate_limit,
+            "remaining": remaining,
+            "reset": reset_time,
+            "used": self.server.rate_limit - remaining,
+        }
+        self.send_json({"resources": {"core": rate}, "rate": rate})
+
+    def send_user(self, _: dict) -> None:
+        account = self.server.account
+
+        self.send_json(
+            {
+                "login": account.login,
+                "url": f"{self.get_base_url()}/users/{account.login}",
+            },
+        )
+
+    def send_orgs(self, _: dict) -> None:
+        self.send_json(self.server.account.orgs)
+
+    def send_org(self, _: dict, login: str) -> None:
+        org = next(
+            (org for org in self.server.account.orgs if org["login"] == login),
+            None,
+        )
+
+        if org is None:
+            self.send_error(404)
+        else:
+            self.send_json(org)
+
+    def send_repos(self, parameters: dict) -> None:
+        account = self.server.account
+        page = int(parameters.get("page", ["1"])[0])
+        per_page = min(
+            int(parameters.get("per_page", [DEFAULT_PER_PAGE])[0]),
+            MAX_PER_PAGE,
+        )
+
+        with account.lock:
+            repos = account.repos[(page - 1) * per_page : page * per_page]
+            repos = [self.get_repo_data(repo) for repo in repos]
+            has_next = page * per_page < len(account.repos)
+
+        headers = {}
+        if has_next:
+            headers["Link"] = (
+                f"<{self.get_base_url()}/user/repos?per_page={per_page}"
+                f'&page={page + 1}>; rel="next"'
+            )
+
+        self.send_json(repos, headers)
+
+    def send_languages(self, _: dict, full_name: str) -> None:
+        account = self.server.account
+        with account.lock:
+            languages = dict(account.languages.get(full_name, {}))
+
+        self.send_json(languages)
+
+    def send_repo(self, _: dict, full_name: str) -> None:
+        account = self.server.account
+        with account.lock:
+            repo = next(
+                (
+                    repo
+                    for repo in account.repos
+                    if repo["full_name"] == full_name
+                ),
+                None,
+            )
+
+        if repo is None:
+            self.send_error(404)
+        else:
+            self.send_json(self.get_repo_data(repo))
+
+    def get_routes(self) -> list[tuple[str, typing.Callable[..., None]]]:
+        login = re.escape(self.server.account.login)
+
+        return [
+            (r"/__stats", self.send_stats),
+            (r"/rate_limit", self.send_rate_limit),
+            (rf"/user|/users/{login}", self.send_user),
+            (rf"/user/orgs|/users/{login}/orgs", self.send_orgs),
+            (r"/orgs/([^/]+)", self.send_org),
+            (r"/user/repos", self.send_repos),
+            (r"/repos/([^/]+/[^/]+)/languages", self.send_languages),
+            (r"/repos/([^/]+/[^/]+)", self.send_repo),
+        ]
+
+    def do_GET(self) -> None:  # noqa: N802
+        url = urlparse(self.path)
+        parameters = parse_qs(url.query)
+
+        for pattern, handler in self.get_routes():
+            if match := re.fullmatch(pattern, url.path):
+                handler(parameters, *match.groups())
+
+                return
+
+        self.send_error(404)
+
+    def do_POST(self) -> None:  # noqa: N802
+        url = urlparse(self.path)
+        account = self.server.account
+
+        if url.path == "/__push":
+            length = int(self.headers["Content-Length"])
+            account.push(json.loads(self.rfile.read(length))["count"])
+            self.send_json({}, counted=False)
+
+            return
+
+        if not url.path.endswith("/graphql"):
+            self.send_error(404)
+
+            return
+
+        length = int(self.headers["Content-Length"])
+        body = json.loads(self.rfile.read(length))
+        variables = body["variables"]
+        start = int(variables["cursor"] or 0)
+        end = start + variables["first"]
+
+        with account.lock:
+            if "organizations" in body["query"]:
+                connection = "organizations"
+                items = account.orgs
+                nodes = [
+                    {"login": org["login"], "name": org["name"]}
+                    for org in items[start:end]
+                ]
+            else:
+                connection = "repositories"
+                items = account.repos
+                nodes = [
+                    {
+                        "name": repo["name"],
+                        "description": repo["description"],
+                        "owner": repo["owner"],
+                        "createdAt": repo["created_at"],
+                        "pushedAt": repo["pushed_at"],
+                        "stargazerCount": repo["stargazers_count"],
+                        "isPrivate": repo["private"],
+                        "isFork": repo["fork"],
+                        "isArchived": repo["archived"],
+                        "languages": {
+                            "nodes": [
+                                {"name": language}
+                                for language in account.languages[
+                                    repo["full_name"]
+                                ]
+                            ],
+                        },
+                    }
+                    for repo in items[start:end]
+                ]
+
+        self.send_json(
+            {
+                "data": {
+                    "viewer": {
+                        connection: {
+                            "pageInfo": {
+                                "hasNextPage": end < len(items),
+                                "endCursor": str(end),
+                            },
+                            "nodes": nodes,
+                        },
+                    },
+                },
+            },
+        )
+
+
+class GitHubStubServer(ThreadingHTTPServer):
+    account: SyntheticAccount
+    rate_limit: int
+    rate_limit_window: int
+    requests_count: int
+    not_modified_count: int
+    used_count: int
+    reset_time: int
+    stats_lock: threading.Lock
+
+    def __init__(
+        self,
+        account: SyntheticAccount,
+        port: int = 0,
+        rate_limit: int = RATE_LIMIT,
+        rate_limit_window: int = RATE_LIMIT_WINDOW,
+    ) -> None:
+        super().__init__(("127.0.0.1", port), GitHubStubHandler)
+
+        self.account = account
+        self.rate_limit = rate_limit
+        self.rate_limit_window = rate_limit_window
+        self.requests_count = 0
+        self.not_modified_count = 0
+        self.used_count = 0
+        self.reset_time = int(time.time()) + rate_limit_window
+        self.stats_lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def get_rate_limit(self) -> tuple[int, int]:
+        with self.stats_lock:
+            if time.time() >= self.reset_time:
+                self.used_count = 0
+                self.reset_time = int(time.time()) + self.rate_limit_window
+
+            return self.rate_limit - self.used_count, self.reset_time
+
+    def count_request(self, *, not_modified: bool) -> tuple[int, int]:
+        with self.stats_lock:
+            self.requests_count += 1
+            self.not_modified_count += int(not_modified)
+            self.used_count += int(not not_modified)
+
+        return self.get_rate_limit()
+
+    def get_stats(self) -> dict[str, int]:
+        with self.stats_lock:
+            return {
+                "requests": self.requests_count,
+                "not_modified": self.not_modified_count,
+            }
+
+
+@click.command()
+@click.option(
+    "--repos",
+    "repos_count",
+    type=click.IntRange(min=0),
+    default=100,
+    show_default=True,
+    help="Number of repositories of the synthetic account",
+)
+@click.option(
+    "--orgs",
+    "orgs_count",
+    type=click.IntRange(min=1),
+    default=10,
+    show_default=True,
+    help="Number of organisations of the synthetic account",
+)
+@click.option(
+    "--rate-limit",
+    type=click.IntRange(min=1),
+    default=RATE_LIMIT,
+    show_default=True,
+    help="Number of requests allowed in each rate limit window",
+)
+@click.option(
+    "--rate-limit-window",
+    type=click.IntRange(min=1),
+    default=RATE_LIMIT_WINDOW,
+    show_default=True,
+    help="Duration of the rate limit windows, in seconds",
+)
+@click.option(
+    "--port",
+    type=click.IntRange(min=0),
+    default=8080,
+    show_default=True,
+    help="Port on which the server listens",
+)
+def main(
+    repos_count: int,
+    orgs_count: int,
+    rate_limit: int,
+    rate_limit_window: int,
+    port: int,
+) -> None:
+    server = GitHubStubServer(
+        SyntheticAccount(repos_count, orgs_count),
+        port,
+        rate_limit,
+        rate_limit_window,
+    )
+
+    click.echo(f"The stand-in GitHub API is served on {server.url}.")
+
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
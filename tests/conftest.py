@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import typing
+from datetime import datetime, timezone
+
+import pytest
+
+from gitportfolio.cache import Cache
+from gitportfolio.helpers import Singleton
+from tests.helpers import create_repo
+
+if typing.TYPE_CHECKING:
+    from pathlib import Path
+
+    from gitportfolio.facade import RepositoryFacade
+
+
+@pytest.fixture()
+def repos() -> list[RepositoryFacade]:
+    # The repositories share some of their members, so that the ties are
+    # covered.
+    return [
+        create_repo(
+            f"repository-{index}",
+            owner=["octocat", "org0", "org1"][index % 3],
+            creation_date=datetime(
+                2015 + index % 4,
+                1,
+                1,
+                tzinfo=timezone.utc,
+            ),
+            last_push=datetime(2020, 1 + index % 5, 1, tzinfo=timezone.utc),
+            languages=[["Python"], ["Go", "C"], []][index % 3],
+            tags=[["cli"], ["web", "cli"], []][index % 3],
+            stars_count=[10, 0, 10, 5][index % 4],
+            is_private=index % 2 == 0,
+            is_fork=index % 5 == 0,
+            is_archived=index % 7 == 0,
+            is_shown=index % 6 != 0,
+        )
+        for index in range(24)
+    ]
+
+
+@pytest.fixture()
+def cache(tmp_path: Path) -> typing.Iterator[Cache]:
+    # The cache is a singleton, so that each test starts over from a new one.
+    Singleton._instances.pop(Cache, None)  # noqa: SLF001
+    cache = Cache(str(tmp_path))
+    cache.cache = {}
+
+    yield cache
+
+    cache.close()
+    Singleton._instances.pop(Cache, None)  # noqa: SLF001
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import typing
+from datetime import datetime, timezone
+
+from gitportfolio.facade import RepositoryFacade
+
+DEFAULT_DATE = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+
+def create_repo(name: str, **members: typing.Any) -> RepositoryFacade:
+    return RepositoryFacade(
+        **{
+            "name": name,
+            "description": f"Description of {name}",
+            "owner": "octocat",
+            "creation_date": DEFAULT_DATE,
+            "last_push": DEFAULT_DATE,
+            "languages": [],
+            "tags": [],
+            "stars_count": 0,
+            "is_private": False,
+            "is_fork": False,
+            "is_archived": False,
+            "is_shown": True,
+            **members,
+        },
+    )
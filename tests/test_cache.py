@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import contextlib
+import sqlite3
+import stat
+import threading
+import time
+import typing
+
+import pytest
+
+from gitportfolio.cache import (
+    DEFAULT_FILE_MODE,
+    RECORDS_FILENAME,
+    TEMPORARY_EXTENSION,
+    close_records,
+    lock_folder,
+    prepare_records,
+    write_atomically,
+)
+from gitportfolio.serialization import FORMAT_VERSION
+from tests.helpers import create_repo
+
+if typing.TYPE_CHECKING:
+    from pathlib import Path
+
+    from gitportfolio.cache import Cache
+    from gitportfolio.facade import RepositoryFacade
+
+LOCK_TIMEOUT = 0.2
+
+
+def get_mode(path: Path) -> int:
+    return stat.S_IMODE(path.stat().st_mode)
+
+
+def test_write_atomically(tmp_path: Path) -> None:
+    path = tmp_path / "object.json"
+
+    write_atomically(path, b"first")
+    assert path.read_bytes() == b"first"
+    assert get_mode(path) == DEFAULT_FILE_MODE
+
+    # The mode of the replaced file is kept.
+    path.chmod(0o664)
+    write_atomically(path, b"second")
+    assert path.read_bytes() == b"second"
+    assert get_mode(path) == 0o664  # noqa: PLR2004
+
+    assert not list(tmp_path.glob("*" + TEMPORARY_EXTENSION))
+
+
+def test_write_atomically_keeps_previous_file(tmp_path: Path) -> None:
+    path = tmp_path / "object.json"
+    write_atomically(path, b"previous")
+
+    with pytest.raises(TypeError):
+        write_atomically(path, "not bytes")  # type: ignore[arg-type]
+
+    assert path.read_bytes() == b"previous"
+    assert not list(tmp_path.glob("*" + TEMPORARY_EXTENSION))
+
+
+def is_locked_meanwhile(
+    folder: Path,
+    *,
+    shared: bool,
+) -> tuple[bool, threading.Thread]:
+    acquired = threading.Event()
+
+    def lock() -> None:
+        with lock_folder(str(folder), shared=shared):
+            acquired.set()
+
+    thread = threading.Thread(target=lock)
+    thread.start()
+    locked = not acquired.wait(LOCK_TIMEOUT)
+
+    return locked, thread
+
+
+@pytest.mark.parametrize(
+    ("held_shared", "shared", "expected_locked"),
+    [(True, True, False), (True, False, True), (False, True, True)],
+)
+def test_lock_folder(
+    tmp_path: Path,
+    *,
+    held_shared: bool,
+    shared: bool,
+    expected_locked: bool,
+) -> None:
+    with lock_folder(str(tmp_path), shared=held_shared):
+        locked, thread = is_locked_meanwhile(tmp_path, shared=shared)
+
+    thread.join()
+
+    assert locked == expected_locked
+
+
+def test_recover_records_after_torn_write(
+    cache: Cache,
+    tmp_path: Path,
+) -> None:
+    repos = {
+        f"octocat/repository-{index}": create_repo(f"repository-{index}")
+        for index in range(200)
+    }
+    cache.cache_records("repos", repos)
+    close_records()
+
+    # A write interrupted halfway leaves a truncated file.
+    path = tmp_path / RECORDS_FILENAME
+    path.write_bytes(path.read_bytes()[: path.stat().st_size // 2])
+    cache.cache = {}
+
+    assert cache.load_records("repos") is None
+
+    cache.cache_records("repos", repos)
+    cache.cache = {}
+
+    records = cache.load_records("repos")
+    assert records is not None
+    assert dict(zip(records.keys(), records, strict=True)) == repos
+
+
+def create_repos(count: int) -> dict[str, RepositoryFacade]:
+    return {
+        f"octocat/repository-{index}": create_repo(f"repository-{index}")
+        for index in range(count)
+    }
+
+
+def get_user_version(path: Path) -> int:
+    with contextlib.closing(sqlite3.connect(path)) as connection:
+        (version,) = connection.execute("PRAGMA user_version").fetchone()
+
+    return version
+
+
+def test_load_records(cache: Cache, tmp_path: Path) -> None:
+    repos = create_repos(5)
+    cache.cache_records("repos", repos)
+    cache.cache = {}
+
+    records = cache.load_records("repos")
+    assert records is not None
+    assert records.keys() == list(repos)
+    assert len(records) == len(repos)
+    assert list(records) == list(repos.values())
+    assert records.get("octocat/repository-2") == repos["octocat/repository-2"]
+    assert records.get("octocat/unknown") is None
+
+    assert cache.load_records("unknown") is None
+    assert get_user_version(tmp_path / RECORDS_FILENAME) == FORMAT_VERSION
+
+
+def test_cache_records_partial(cache: Cache) -> None:
+    repos = create_repos(3)
+    cache.cache_records("repos", repos)
+
+    # A partial write updates or appends records, and keeps the others.
+    updates = {
+        "octocat/repository-1": create_repo("repository-1", stars_count=42),
+        "octocat/repository-3": create_repo("repository-3"),
+    }
+    cache.cache_records("repos", updates, partial=True)
+    cache.cache = {}
+
+    records = cache.load_records("repos")
+    assert records is not None
+    assert dict(zip(records.keys(), records, strict=True)) == {
+        **repos,
+        **updates,
+    }
+
+    # A full write replaces the whole collection.
+    cache.cache_records("repos", updates)
+    cache.cache = {}
+
+    records = cache.load_records("repos")
+    assert records is not None
+    assert records.keys() == list(updates)
+
+
+def test_prepare_records_migration(cache: Cache, tmp_path: Path) -> None:
+    path = tmp_path / RECORDS_FILENAME
+    with contextlib.closing(sqlite3.connect(path)) as connection:
+        connection.execute("CREATE TABLE records (key TEXT, value BLOB)")
+        connection.execute(f"PRAGMA user_version = {FORMAT_VERSION - 1}")
+        connection.commit()
+
+    # The records written in a previous format are discarded.
+    assert cache.load_records("repos") is None
+    assert get_user_version(path) == FORMAT_VERSION
+
+    repos = create_repos(3)
+    cache.cache_records("repos", repos)
+    close_records()
+
+    # The records in the current format are kept.
+    with contextlib.closing(sqlite3.connect(path)) as connection:
+        prepare_records(connection)
+
+    cache.cache = {}
+    records = cache.load_records("repos")
+    assert records is not None
+    assert list(records) == list(repos.values())
+
+
+def test_cached_records_corruption_is_a_miss(
+    cache: Cache,
+    tmp_path: Path,
+) -> None:
+    cache.cache_records("repos", create_repos(200))
+    cache.cache = {}
+
+    records = cache.load_records("repos")
+    assert records is not None
+    close_records()
+
+    path = tmp_path / RECORDS_FILENAME
+    path.write_bytes(path.read_bytes()[: path.stat().st_size // 2])
+
+    assert records.get("octocat/repository-199") is None
+    assert not path.exists()
+    assert list(records) == []
+
+
+def test_partial_write_keeps_timestamp(
+    cache: Cache,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(time, "time", lambda: 1000.0)
+    cache.cache_records("repos", create_repos(3))
+
+    monkeypatch.setattr(time, "time", lambda: 2000.0)
+    cache.cache_records(
+        "repos",
+        {"octocat/repository-3": create_repo("repository-3")},
+        partial=True,
+    )
+    assert cache.timestamps["repos"] == 1000.0  # noqa: PLR2004
+
+    cache.cache = {}
+    cache.timestamps = {}
+    assert cache.load_records("repos") is not None
+    assert cache.timestamps["repos"] == 1000.0  # noqa: PLR2004
+
+    cache.cache_records("repos", create_repos(3))
+    assert cache.timestamps["repos"] == 2000.0  # noqa: PLR2004
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import typing
+
+import pytest
+
+from gitportfolio.filters import (
+    RepositoryFacadeAndFilter,
+    RepositoryFacadeArchivedFilter,
+    RepositoryFacadeFilter,
+    RepositoryFacadeForkFilter,
+    RepositoryFacadeOrFilter,
+    RepositoryFacadeOwnerFilter,
+    RepositoryFacadePrivateFilter,
+    RepositoryFacadeShownFilter,
+    RepositoryFacadeTagsFilter,
+    filter_repos,
+)
+
+if typing.TYPE_CHECKING:
+    from gitportfolio.facade import RepositoryFacade
+
+OWNER = RepositoryFacadeOwnerFilter("org0")
+NOT_OWNER = RepositoryFacadeOwnerFilter("org0", inverse=True)
+ARCHIVED = RepositoryFacadeArchivedFilter(is_archived=True)
+PRIVATE = RepositoryFacadePrivateFilter(is_private=True)
+SHOWN = RepositoryFacadeShownFilter(is_shown=True)
+FORK = RepositoryFacadeForkFilter(is_fork=True)
+TAGS = RepositoryFacadeTagsFilter(["cli"])
+NOT_TAGS = RepositoryFacadeTagsFilter(["web"], inverse=True)
+
+
+@pytest.mark.parametrize(
+    ("custom_filter", "expected"),
+    [
+        (OWNER, lambda repo: repo.owner == "org0"),
+        (NOT_OWNER, lambda repo: repo.owner != "org0"),
+        (ARCHIVED, lambda repo: repo.is_archived),
+        (PRIVATE, lambda repo: repo.is_private),
+        (SHOWN, lambda repo: repo.is_shown),
+        (FORK, lambda repo: repo.is_fork),
+        (TAGS, lambda repo: "cli" in repo.tags),
+        (NOT_TAGS, lambda repo: "web" not in repo.tags),
+    ],
+)
+def test_predicate_matches_members(
+    repos: list[RepositoryFacade],
+    custom_filter: RepositoryFacadeFilter,
+    expected: typing.Callable[[RepositoryFacade], bool],
+) -> None:
+    predicate = custom_filter.to_predicate()
+
+    assert any(predicate(repo) for repo in repos)
+    assert not all(predicate(repo) for repo in repos)
+
+    for repo in repos:
+        assert predicate(repo) == expected(repo)
+
+
+@pytest.mark.parametrize(
+    "custom_filter",
+    [
+        OWNER,
+        NOT_OWNER,
+        ARCHIVED,
+        PRIVATE,
+        SHOWN,
+        FORK,
+        TAGS,
+        NOT_TAGS,
+        ~PRIVATE,
+        OWNER & PRIVATE,
+        OWNER | FORK,
+        OWNER & PRIVATE & SHOWN,
+        OWNER | FORK | ARCHIVED,
+        ~(OWNER & TAGS),
+        ~(OWNER | ~FORK),
+        (OWNER | TAGS) & ~(PRIVATE | ARCHIVED),
+        (OWNER & SHOWN) | (NOT_TAGS & ~FORK) | ~~ARCHIVED,
+        RepositoryFacadeAndFilter(OWNER),
+        RepositoryFacadeOrFilter(FORK),
+    ],
+)
+def test_predicate_matches_is_accepted(
+    repos: list[RepositoryFacade],
+    custom_filter: RepositoryFacadeFilter,
+) -> None:
+    predicate = custom_filter.to_predicate()
+
+    for repo in repos:
+        assert predicate(repo) == custom_filter.is_accepted(repo)
+
+
+def test_composition_matches_boolean_operators(
+    repos: list[RepositoryFacade],
+) -> None:
+    custom_filter = (OWNER | TAGS) & ~(PRIVATE | ARCHIVED)
+
+    for repo in repos:
+        expected = (
+            OWNER.is_accepted(repo) or TAGS.is_accepted(repo)
+        ) and not (PRIVATE.is_accepted(repo) or ARCHIVED.is_accepted(repo))
+
+        assert custom_filter.is_accepted(repo) == expected
+
+
+def test_nested_filters_are_flattened() -> None:
+    assert len((OWNER & PRIVATE & SHOWN).filters) == 3  # noqa: PLR2004
+    assert len((OWNER | FORK | ARCHIVED).filters) == 3  # noqa: PLR2004
+    assert len((OWNER & (PRIVATE | SHOWN)).filters) == 2  # noqa: PLR2004
+
+
+def test_filter_repos_applies_all_filters(
+    repos: list[RepositoryFacade],
+) -> None:
+    filtered_repos = filter_repos(repos, OWNER, ~PRIVATE, SHOWN)
+
+    assert filtered_repos == [
+        repo
+        for repo in repos
+        if OWNER.is_accepted(repo)
+        and not PRIVATE.is_accepted(repo)
+        and SHOWN.is_accepted(repo)
+    ]
+    assert filtered_repos
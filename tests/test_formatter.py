@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import typing
+
+import pytest
+
+from gitportfolio.formatter import (
+    UnknownTableColumnError,
+    iterate_repo_table,
+    to_repo_table,
+)
+from tests.helpers import create_repo
+
+if typing.TYPE_CHECKING:
+    from gitportfolio.facade import RepositoryFacade
+
+HEADER = "| Description | Languages |\n| --- | --- |"
+
+
+def get_table(
+    repos: typing.Iterable[RepositoryFacade],
+    **options: typing.Any,
+) -> str:
+    return "".join(
+        iterate_repo_table(repos, ("description", "languages"), **options),
+    )
+
+
+def get_row(name: str) -> str:
+    return (
+        f"\n| <sup><sub>Description of {name}</sub></sup> |"
+        " <sup><sub>Python</sub></sup> |"
+    )
+
+
+@pytest.fixture()
+def table_repos() -> list[RepositoryFacade]:
+    return [
+        create_repo(f"repository-{index}", languages=["Python"])
+        for index in range(5)
+    ]
+
+
+def test_columns(table_repos: list[RepositoryFacade]) -> None:
+    assert get_table(table_repos[:2]) == (
+        HEADER + get_row("repository-0") + get_row("repository-1")
+    )
+
+
+def test_default_columns(table_repos: list[RepositoryFacade]) -> None:
+    table = to_repo_table(table_repos[:1])
+
+    assert table.startswith(
+        "| Identifier | Description | Tags | Metadata |\n"
+        "| --- | --- | --- | --- |\n"
+        "| <sup><sub>[`octocat/repository-0`]",
+    )
+
+
+def test_unknown_columns(table_repos: list[RepositoryFacade]) -> None:
+    with pytest.raises(UnknownTableColumnError):
+        "".join(iterate_repo_table(table_repos, ("description", "unknown")))
+
+    with pytest.raises(UnknownTableColumnError):
+        "".join(iterate_repo_table(table_repos, ()))
+
+
+def test_empty_table() -> None:
+    assert get_table([]) == HEADER
+
+
+@pytest.mark.parametrize("limit", [0, 2, 5, 10])
+def test_limit(table_repos: list[RepositoryFacade], limit: int) -> None:
+    expected_rows = "".join(get_row(repo.name) for repo in table_repos[:limit])
+
+    assert get_table(iter(table_repos), limit=limit) == HEADER + expected_rows
+
+
+def test_page_size(table_repos: list[RepositoryFacade]) -> None:
+    # The tables of two rows are separated by an empty line.
+    assert get_table(table_repos, page_size=2) == (
+        HEADER
+        + get_row("repository-0")
+        + get_row("repository-1")
+        + "\n\n"
+        + HEADER
+        + get_row("repository-2")
+        + get_row("repository-3")
+        + "\n\n"
+        + HEADER
+        + get_row("repository-4")
+    )
+
+
+def test_page_size_with_limit(table_repos: list[RepositoryFacade]) -> None:
+    assert get_table(table_repos, limit=3, page_size=3) == (
+        HEADER
+        + get_row("repository-0")
+        + get_row("repository-1")
+        + get_row("repository-2")
+    )
+
+
+def test_escaping() -> None:
+    repo = create_repo(
+        "repository",
+        description="Pipes | and\r\nlines",
+        languages=["C|C++", "Go"],
+    )
+
+    assert get_table([repo]) == (
+        HEADER
+        + "\n| <sup><sub>Pipes \\| and lines</sub></sup> |"
+        " <sup><sub>C\\|C++, Go</sub></sup> |"
+    )
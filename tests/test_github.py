@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import threading
+import typing
+
+import pytest
+import yaml
+from scripts.github_stub import GitHubStubServer, SyntheticAccount
+
+from gitportfolio import github
+from gitportfolio.config import Configuration
+from gitportfolio.helpers import Singleton
+
+if typing.TYPE_CHECKING:
+    from pathlib import Path
+
+    from gitportfolio.cache import Cache
+    from gitportfolio.facade import RepositoryFacade
+
+REPOS_COUNT = 150
+ORGS_COUNT = 3
+PUSHED_COUNT = 3
+PAGES_COUNT = 2
+
+
+@pytest.fixture()
+def server() -> typing.Iterator[GitHubStubServer]:
+    server = GitHubStubServer(SyntheticAccount(REPOS_COUNT, ORGS_COUNT))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture()
+def configuration(
+    server: GitHubStubServer,
+    cache: Cache,  # noqa: ARG001
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> typing.Iterator[Configuration]:
+    monkeypatch.setenv("GITHUB_PAT", "stub-personal-access-token")
+
+    path = tmp_path / "config.yaml"
+    path.write_text(
+        yaml.dump(
+            {
+                "orgs": {},
+                "repos": {},
+                "tags": {},
+                "fetching": {"api_url": server.url, "workers": 4},
+            },
+        ),
+    )
+
+    Singleton._instances.pop(Configuration, None)  # noqa: SLF001
+
+    yield Configuration(str(path))
+
+    github.close_github_client()
+    github.account_namespaces.clear()
+    github.synced_accounts.clear()
+    Singleton._instances.pop(Configuration, None)  # noqa: SLF001
+
+
+def sync_repos(
+    server: GitHubStubServer,
+) -> tuple[dict[str, RepositoryFacade], dict[str, int]]:
+    before = server.get_stats()
+
+    backend = github.RestFetchBackend(Configuration().get_accounts()[0], 4)
+    repos = {repo.full_name: repo for repo in backend.sync_repos()}
+
+    after = server.get_stats()
+
+    return repos, {key: after[key] - before[key] for key in after}
+
+
+def test_incremental_sync(
+    server: GitHubStubServer,
+    configuration: Configuration,  # noqa: ARG001
+) -> None:
+    repos, stats = sync_repos(server)
+    assert len(repos) == REPOS_COUNT
+    assert stats == {"requests": PAGES_COUNT + REPOS_COUNT, "not_modified": 0}
+
+    # The unchanged pages are not modified, and no languages are fetched.
+    synced_repos, stats = sync_repos(server)
+    assert synced_repos == repos
+    assert stats == {"requests": PAGES_COUNT, "not_modified": PAGES_COUNT}
+
+    # Only the languages of the pushed repositories are fetched again, on
+    # the first page.
+    server.account.push(PUSHED_COUNT)
+    pushed_repos = [
+        repo["full_name"] for repo in server.account.repos[:PUSHED_COUNT]
+    ]
+
+    synced_repos, stats = sync_repos(server)
+    assert stats == {
+        "requests": PAGES_COUNT + PUSHED_COUNT,
+        "not_modified": PAGES_COUNT - 1,
+    }
+    assert {
+        full_name
+        for full_name, repo in synced_repos.items()
+        if repo != repos[full_name]
+    } == set(pushed_repos)
+    for full_name in pushed_repos:
+        assert "Python" in synced_repos[full_name].languages
+
+
+def test_incremental_sync_without_repo_state(
+    server: GitHubStubServer,
+    configuration: Configuration,  # noqa: ARG001
+    cache: Cache,
+) -> None:
+    repos, _ = sync_repos(server)
+
+    # A page listing a repository without a state is fetched again.
+    repos_key = github.get_cache_key(
+        Configuration().get_accounts()[0],
+        github.REPOS_SYNC_CACHE_KEY,
+    )
+    repo_states = cache.get_cached_records(repos_key)
+    assert repo_states is not None
+    missing_repo = server.account.repos[-1]["full_name"]
+    cache.cache_records(
+        repos_key,
+        {
+            full_name: repo_state
+            for full_name, repo_state in zip(
+                repo_states.keys(),
+                repo_states,
+                strict=True,
+            )
+            if full_name != missing_repo
+        },
+    )
+
+    # Its languages are also fetched again.
+    synced_repos, stats = sync_repos(server)
+    assert synced_repos == repos
+    assert stats == {
+        "requests": PAGES_COUNT + 1,
+        "not_modified": PAGES_COUNT - 1,
+    }
+
+
+def test_backends_return_same_facades(
+    configuration: Configuration,  # noqa: ARG001
+) -> None:
+    account = Configuration().get_accounts()[0]
+    rest_backend = github.RestFetchBackend(account, 4)
+    graphql_backend = github.GraphQLFetchBackend(account, 4)
+
+    rest_orgs = list(rest_backend.fetch_orgs())
+    assert list(graphql_backend.fetch_orgs()) == rest_orgs
+
+    graphql_repos = list(graphql_backend.fetch_repos())
+    assert len(graphql_repos) == REPOS_COUNT
+    assert graphql_repos == list(rest_backend.fetch_repos())
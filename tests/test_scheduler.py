@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import pytest
+
+from gitportfolio import scheduler
+from gitportfolio.scheduler import RequestScheduler
+
+START_TIME = 1000.0
+RESET_DELAY = 60.0
+
+
+class Clock:
+    time: float
+    sleeps: list[float]
+
+    def __init__(self) -> None:
+        self.time = START_TIME
+        self.sleeps = []
+
+    def sleep(self, delay: float) -> None:
+        self.sleeps.append(delay)
+        self.time += delay
+
+
+@pytest.fixture()
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(scheduler.time, "time", lambda: clock.time)
+    monkeypatch.setattr(scheduler.time, "sleep", clock.sleep)
+
+    return clock
+
+
+def create_scheduler(remaining: int, reserve: int) -> RequestScheduler:
+    # The rate limit is only known from the initial update, as if the
+    # responses did not carry it.
+    request_scheduler = RequestScheduler(lambda: (-1, 0), reserve)
+    request_scheduler.update_rate_limit(remaining, START_TIME + RESET_DELAY)
+
+    return request_scheduler
+
+
+def test_requests_are_paced_within_reserve(clock: Clock) -> None:
+    request_scheduler = create_scheduler(20, 10)
+
+    for _ in range(10):
+        request_scheduler.run(lambda: None)
+
+    assert clock.sleeps == []
+
+    # The reserve is spread until the reset, instead of being exhausted at
+    # once.
+    for _ in range(10):
+        request_scheduler.run(lambda: None)
+
+    assert len(clock.sleeps) == 9  # noqa: PLR2004
+    assert all(delay > 0 for delay in clock.sleeps)
+    assert clock.time <= START_TIME + RESET_DELAY
+    assert request_scheduler.remaining == 0
+    assert request_scheduler.waiting_time == sum(clock.sleeps)
+
+
+def test_not_modified_requests_are_not_counted(clock: Clock) -> None:
+    request_scheduler = create_scheduler(100, 10)
+
+    request_scheduler.run(lambda: None)
+    request_scheduler.run(lambda: None)
+    request_scheduler.refund()
+
+    assert request_scheduler.remaining == 99  # noqa: PLR2004
+    assert request_scheduler.requests_count == 1
+    assert request_scheduler.not_modified_count == 1
+    assert clock.sleeps == []
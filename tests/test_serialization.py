@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+
+from gitportfolio.facade import OrganisationFacade
+from gitportfolio.serialization import (
+    DOCUMENT_SEPARATOR,
+    CorruptedCacheError,
+    Decoder,
+    IncompatibleCacheError,
+    UnserializableObjectError,
+    decode_document,
+    encode_document,
+    encode_record,
+)
+from tests.helpers import create_repo
+
+REPO = create_repo(
+    "repository",
+    description="Description with | and \n",
+    last_push=datetime(2021, 2, 3, 4, 5, 6, tzinfo=timezone.utc),
+    languages=["Python", "C"],
+    tags=["cli"],
+    stars_count=42,
+    is_fork=True,
+)
+ORG = OrganisationFacade("Organisation", "org", excluded=True)
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        None,
+        [],
+        {},
+        "text with é and \n",
+        [1, 2.5, True, None],
+        {"key": {"nested": ["value"]}},
+        datetime(2022, 1, 1, tzinfo=timezone.utc),
+        REPO,
+        ORG,
+        [REPO, ORG],
+        {"repos": {REPO.full_name: REPO}, "orgs": [ORG]},
+    ],
+)
+def test_document_round_trip(obj: object) -> None:
+    assert decode_document(encode_document(obj)) == obj
+
+
+@pytest.mark.parametrize("record", [REPO, ORG, {"pushed_at": None}, [1]])
+def test_record_round_trip(record: object) -> None:
+    kind, data = encode_record(record)
+
+    assert Decoder().decode_record(kind, data) == record
+
+
+def test_unserializable_object() -> None:
+    with pytest.raises(UnserializableObjectError):
+        encode_document({"set": {1, 2}})
+
+
+def test_truncated_document() -> None:
+    data = encode_document({"repos": [REPO] * 10})
+
+    for length in [len(data) - 1, len(data) // 2]:
+        with pytest.raises(CorruptedCacheError):
+            decode_document(data[:length])
+
+
+def test_document_without_data() -> None:
+    header, _, _ = encode_document([REPO]).partition(DOCUMENT_SEPARATOR)
+
+    with pytest.raises(CorruptedCacheError):
+        decode_document(header)
+
+
+def test_checksum_mismatch() -> None:
+    header, separator, body = encode_document({"stars": 42}).partition(
+        DOCUMENT_SEPARATOR,
+    )
+
+    # The damaged data is still valid JSON.
+    with pytest.raises(CorruptedCacheError):
+        decode_document(header + separator + body.replace(b"42", b"43"))
+
+
+def test_incompatible_document() -> None:
+    _, _, body = encode_document([ORG]).partition(DOCUMENT_SEPARATOR)
+
+    with pytest.raises(IncompatibleCacheError):
+        decode_document(b'{"version":0}' + DOCUMENT_SEPARATOR + body)
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import itertools
+import typing
+
+import pytest
+
+from gitportfolio.sorters import RepositoryFacadeSortKey, sort_repos
+
+if typing.TYPE_CHECKING:
+    from gitportfolio.facade import RepositoryFacade
+
+STARS = RepositoryFacadeSortKey("stars_count")
+STARS_DESCENDING = RepositoryFacadeSortKey("stars_count", reverse=True)
+NAME = RepositoryFacadeSortKey("name")
+NAME_DESCENDING = RepositoryFacadeSortKey("name", reverse=True)
+CREATION_DESCENDING = RepositoryFacadeSortKey("creation_date", reverse=True)
+OWNER = RepositoryFacadeSortKey("owner")
+UNKNOWN = RepositoryFacadeSortKey("unknown")
+
+
+@pytest.mark.parametrize(
+    "keys",
+    [
+        (STARS,),
+        (STARS_DESCENDING,),
+        (OWNER, STARS),
+        (STARS_DESCENDING, CREATION_DESCENDING),
+        (STARS_DESCENDING, NAME),
+        (OWNER, STARS_DESCENDING, NAME),
+        (CREATION_DESCENDING, OWNER, NAME_DESCENDING),
+        (UNKNOWN,),
+        (STARS_DESCENDING, UNKNOWN),
+    ],
+)
+@pytest.mark.parametrize("limit", [0, 1, 5, 24, 100])
+def test_limited_sort_matches_sliced_sort(
+    repos: list[RepositoryFacade],
+    keys: tuple[RepositoryFacadeSortKey, ...],
+    limit: int,
+) -> None:
+    assert sort_repos(repos, *keys, limit=limit) == (
+        sort_repos(repos, *keys)[:limit]
+    )
+
+
+def test_sort_is_stable(repos: list[RepositoryFacade]) -> None:
+    sorted_repos = sort_repos(repos, STARS_DESCENDING)
+
+    # The repositories with as many stars keep their order.
+    for previous, current in itertools.pairwise(sorted_repos):
+        assert previous.stars_count >= current.stars_count
+        if previous.stars_count == current.stars_count:
+            assert repos.index(previous) < repos.index(current)
+
+
+def test_sort_does_not_modify_repos(repos: list[RepositoryFacade]) -> None:
+    original_repos = list(repos)
+
+    sort_repos(repos, NAME_DESCENDING)
+    sort_repos(repos, NAME_DESCENDING, limit=3)
+
+    assert repos == original_repos
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import typing
+
+import pytest
+
+from gitportfolio.table import RepositoryTable
+
+if typing.TYPE_CHECKING:
+    from gitportfolio.facade import RepositoryFacade
+
+MaskGetter = typing.Callable[[RepositoryTable], int]
+Predicate = typing.Callable[["RepositoryFacade"], bool]
+
+MASKS: list[tuple[MaskGetter, Predicate]] = [
+    (lambda table: table.full_mask, lambda _: True),
+    (lambda _: 0, lambda _: False),
+    (lambda table: table.flag("is_private"), lambda repo: repo.is_private),
+    (
+        lambda table: table.flag("is_fork", value=False),
+        lambda repo: not repo.is_fork,
+    ),
+    (lambda table: table.owner("org0"), lambda repo: repo.owner == "org0"),
+    (lambda table: table.owner("unknown"), lambda _: False),
+    (
+        lambda table: table.language("Python"),
+        lambda repo: "Python" in repo.languages,
+    ),
+    (
+        lambda table: table.tags(["web", "unknown"]),
+        lambda repo: "web" in repo.tags,
+    ),
+    (
+        lambda table: table.flag("is_shown")
+        & table.invert(table.language("Go") | table.flag("is_archived")),
+        lambda repo: repo.is_shown
+        and not ("Go" in repo.languages or repo.is_archived),
+    ),
+]
+
+
+@pytest.fixture()
+def table(repos: list[RepositoryFacade]) -> RepositoryTable:
+    return RepositoryTable(repos)
+
+
+@pytest.mark.parametrize(("get_mask", "predicate"), MASKS)
+def test_select(
+    table: RepositoryTable,
+    repos: list[RepositoryFacade],
+    get_mask: MaskGetter,
+    predicate: Predicate,
+) -> None:
+    mask = get_mask(table)
+    expected_repos = [repo for repo in repos if predicate(repo)]
+
+    assert table.select(mask) == expected_repos
+    assert table.count(mask) == len(expected_repos)
+    assert table.sum_column("stars_count", mask) == sum(
+        repo.stars_count for repo in expected_repos
+    )
+
+
+def test_select_without_mask(
+    table: RepositoryTable,
+    repos: list[RepositoryFacade],
+) -> None:
+    assert table.select() == repos
+    assert table.count() == len(repos)
+    assert table.sum_column("stars_count") == sum(
+        repo.stars_count for repo in repos
+    )
+
+
+@pytest.mark.parametrize(
+    ("column", "key"),
+    [
+        ("stars_count", lambda repo: repo.stars_count),
+        ("creation_date", lambda repo: repo.creation_date),
+        ("name", lambda repo: repo.name),
+    ],
+)
+@pytest.mark.parametrize("reverse", [False, True])
+@pytest.mark.parametrize("limit", [None, 5])
+def test_sort(  # noqa: PLR0913
+    table: RepositoryTable,
+    repos: list[RepositoryFacade],
+    column: str,
+    key: typing.Callable[[RepositoryFacade], typing.Any],
+    *,
+    reverse: bool,
+    limit: int | None,
+) -> None:
+    get_mask, predicate = MASKS[-1]
+    expected_repos = sorted(
+        (repo for repo in repos if predicate(repo)),
+        key=key,
+        reverse=reverse,
+    )[:limit]
+
+    assert (
+        table.sort(column, get_mask(table), reverse=reverse, limit=limit)
+        == expected_repos
+    )
+
+
+@pytest.mark.parametrize(("get_mask", "predicate"), MASKS)
+def test_aggregations(
+    table: RepositoryTable,
+    repos: list[RepositoryFacade],
+    get_mask: MaskGetter,
+    predicate: Predicate,
+) -> None:
+    mask = get_mask(table)
+    expected_repos = [repo for repo in repos if predicate(repo)]
+    languages = {language for repo in repos for language in repo.languages}
+    owners = {repo.owner for repo in repos}
+
+    assert table.count_by("languages", mask) == {
+        language: sum(language in repo.languages for repo in expected_repos)
+        for language in languages
+    }
+    assert table.sum_by("owner", "stars_count", mask) == {
+        owner: sum(
+            repo.stars_count for repo in expected_repos if repo.owner == owner
+        )
+        for owner in owners
+    }
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import http.client
+import json
+import os
+import queue
+import threading
+import typing
+from http import HTTPStatus
+from pathlib import Path
+
+import pytest
+
+from gitportfolio.watch import (
+    MAX_NOTIFICATION_SIZE,
+    Watcher,
+    create_notification_server,
+)
+
+if typing.TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+PLACEHOLDER = "<!-- gitportfolio: {} -->"
+
+
+@pytest.fixture()
+def watcher(tmp_path: Path) -> Watcher:
+    (tmp_path / "config.yaml").write_text("{}\n")
+
+    datasources = tmp_path / "datasources"
+    datasources.mkdir()
+    for name in ("watched_stars", "watched_topics", "watched_helpers"):
+        (datasources / f"{name}.py").write_text("")
+
+    (tmp_path / "stars.md").write_text(
+        PLACEHOLDER.format("watched_stars|count"),
+    )
+    (tmp_path / "topics.md").write_text(
+        PLACEHOLDER.format("watched_topics|count")
+        + PLACEHOLDER.format("get_repos|count"),
+    )
+
+    return Watcher(
+        str(datasources),
+        [
+            (str(tmp_path / "stars.md"), str(tmp_path / "stars.out.md")),
+            (str(tmp_path / "topics.md"), str(tmp_path / "topics.out.md")),
+        ],
+        str(tmp_path / "config.yaml"),
+    )
+
+
+def touch(path: Path) -> None:
+    modification_time = path.stat().st_mtime + 1
+    os.utime(path, (modification_time, modification_time))
+
+
+def test_get_changed_paths(watcher: Watcher, tmp_path: Path) -> None:
+    assert watcher.get_changed_paths() == set()
+
+    touch(tmp_path / "stars.md")
+    assert watcher.get_changed_paths() == {tmp_path / "stars.md"}
+    assert watcher.get_changed_paths() == set()
+
+    # The added and the removed data sources are changes as well.
+    added_path = tmp_path / "datasources" / "watched_languages.py"
+    added_path.write_text("")
+    assert watcher.get_changed_paths() == {added_path}
+
+    removed_path = tmp_path / "datasources" / "watched_topics.py"
+    removed_path.unlink()
+    assert watcher.get_changed_paths() == {removed_path}
+
+
+@pytest.mark.parametrize(
+    ("changed_names", "expected_names", "expected_templates"),
+    [
+        (["watched_stars"], {"watched_stars"}, ["stars.md"]),
+        (["watched_topics"], {"watched_topics"}, ["topics.md"]),
+        # A module that is not a data source reloads all the custom ones.
+        (
+            ["watched_helpers"],
+            {"watched_stars", "watched_topics"},
+            ["stars.md", "topics.md"],
+        ),
+    ],
+)
+def test_handle_changes(
+    watcher: Watcher,
+    monkeypatch: pytest.MonkeyPatch,
+    *,
+    changed_names: list[str],
+    expected_names: set[str],
+    expected_templates: list[str],
+) -> None:
+    datasources = Path(watcher.custom_datasources_folder)
+    changed_paths = {datasources / f"{name}.py" for name in changed_names}
+    assert watcher.reload_datasources(changed_paths) == expected_names
+
+    renders: list[tuple[str, str]] = []
+    monkeypatch.setattr(watcher, "render", renders.extend)
+
+    watcher.handle_changes(changed_paths)
+
+    assert sorted(renders) == [
+        render
+        for render in watcher.renders
+        if Path(render[0]).name in expected_templates
+    ]
+
+
+def test_handle_template_changes(
+    watcher: Watcher,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    renders: list[tuple[str, str]] = []
+    monkeypatch.setattr(watcher, "render", renders.extend)
+
+    watcher.handle_changes({tmp_path / "topics.md"})
+
+    assert renders == [watcher.renders[1]]
+
+
+@pytest.fixture()
+def notification_server() -> (
+    typing.Iterator[tuple[ThreadingHTTPServer, queue.Queue[str]]]
+):
+    notifications: queue.Queue[str] = queue.Queue()
+    server = create_notification_server("127.0.0.1", 0, notifications)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    yield server, notifications
+
+    server.shutdown()
+    server.server_close()
+
+
+def post_notification(
+    server: ThreadingHTTPServer,
+    body: bytes,
+    length: int | None = None,
+) -> int:
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_port)
+    try:
+        connection.request(
+            "POST",
+            "/",
+            body=body,
+            headers={
+                "Content-Length": str(len(body) if length is None else length),
+            },
+        )
+
+        return connection.getresponse().status
+    finally:
+        connection.close()
+
+
+def test_notification_accepted(
+    notification_server: tuple[ThreadingHTTPServer, queue.Queue[str]],
+) -> None:
+    server, notifications = notification_server
+    payload = {"repository": {"full_name": "octocat/hello-world"}}
+
+    status = post_notification(server, json.dumps(payload).encode())
+
+    assert status == HTTPStatus.ACCEPTED
+    assert notifications.get_nowait() == "octocat/hello-world"
+
+
+@pytest.mark.parametrize(
+    ("body", "length"),
+    [
+        (b"not json", None),
+        (b"{}", None),
+        (b"[]", None),
+        (b'{"repository": {"full_name": 42}}', None),
+        (b"{}", MAX_NOTIFICATION_SIZE + 1),
+    ],
+)
+def test_notification_rejected(
+    notification_server: tuple[ThreadingHTTPServer, queue.Queue[str]],
+    body: bytes,
+    length: int | None,
+) -> None:
+    server, notifications = notification_server
+
+    status = post_notification(server, body, length)
+
+    assert status == HTTPStatus.BAD_REQUEST
+    assert notifications.empty()